@@ -0,0 +1,170 @@
+# backend/app/admission.py
+"""
+Admission control: keep bursts out of the connection pool instead of queueing in it.
+
+Each route group gets a concurrency limit carved out of the worker's pool
+(pool_size + max_overflow, less the connections background work may hold), so
+analytics can't starve checkout and the catalog can't starve either. A slot is
+held until the request's dependencies have returned their connection to the
+pool. A request waits for a slot at most the latency budget
+(ADMISSION_QUEUE_TIMEOUT_MS), and not at all once as many requests are already
+waiting as the group has slots; either way it gets a fast 503 with Retry-After.
+Clients are also rate limited with a token bucket (429). Limits are per worker.
+"""
+import asyncio
+import math
+import threading
+import time
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from .config import settings
+from .metrics import REQUESTS_SHED
+
+# Long-lived or database-free paths, never limited
+EXEMPT_PATHS = ("/metrics", "/health", "/uploads", "/api/orders/events", "/api/docs", "/api/redoc", "/openapi.json")
+
+# Pooled connections taken outside any route group: app.maintenance jobs (2), the
+# suggestion index rebuild (1) and Last-Event-ID replays (1, app.order_events)
+BACKGROUND_CONNECTIONS = 4
+
+# (group, path prefix, share of the rest of the pool), first match wins. Writes
+# to /api/orders (checkout) keep their own share whatever the catalog is doing.
+# Shares sum to 1 and slots are rounded down, so the groups never oversubscribe.
+ROUTE_GROUPS = [
+    ("analytics", "/api/analytics", 0.2),
+    ("orders", "/api/orders", 0.3),
+    ("catalog", "/api/products", 0.4),
+    ("other", "", 0.1),
+]
+
+
+class ConcurrencyLimit:
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.waiting = 0
+        self._semaphore = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created on first use so it binds to the server's event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.slots)
+        return self._semaphore
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.semaphore.locked() and self.waiting >= self.slots:
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+
+    def release(self):
+        self.semaphore.release()
+
+
+class TokenBuckets:
+    """Per-client token buckets; idle clients are forgotten once the table grows"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, client: str) -> float:
+        """Take a token; returns 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens < 1:
+                self._buckets[client] = (tokens, now)
+                return (1 - tokens) / self.rate
+            self._buckets[client] = (tokens - 1, now)
+
+            if len(self._buckets) > self.max_clients:
+                # A bucket idle long enough to have refilled is the same as no bucket
+                full_after = self.burst / self.rate
+                self._buckets = {
+                    key: value for key, value in self._buckets.items() if now - value[1] < full_after
+                }
+            return 0
+
+
+def pool_capacity() -> int:
+    """Connections the route groups share"""
+    return max(1, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW - BACKGROUND_CONNECTIONS)
+
+
+limits = {
+    group: ConcurrencyLimit(max(1, math.floor(share * pool_capacity())))
+    for group, _, share in ROUTE_GROUPS
+}
+buckets = TokenBuckets(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST)
+
+
+def route_group(path: str) -> str:
+    for group, prefix, _ in ROUTE_GROUPS:
+        if path.startswith(prefix):
+            return group
+
+
+def client_key(request: Request) -> str:
+    # Each trusted proxy appends the address it saw, so the client is the entry
+    # TRUSTED_PROXY_HOPS from the right; anything left of it is client-supplied.
+    # With no proxies (0) the header is ignored, as any client can send it.
+    hops = settings.TRUSTED_PROXY_HOPS
+    forwarded = [address.strip() for address in request.headers.get("x-forwarded-for", "").split(",")]
+    forwarded = [address for address in forwarded if address]
+    if hops > 0 and forwarded:
+        return forwarded[-min(hops, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+
+def rejected(status_code: int, retry_after: float, detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class AdmissionMiddleware:
+    """
+    Plain ASGI rather than @app.middleware("http"): call_next returns once the
+    response has started, before the teardown of the request's dependencies has
+    closed its session, whereas awaiting the app covers the whole request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or path == "/" or path.startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(path)
+        wait = buckets.take(client_key(Request(scope)))
+        if wait:
+            REQUESTS_SHED.labels(group, "rate_limited").inc()
+            await rejected(429, wait, "Too many requests, slow down")(scope, receive, send)
+            return
+
+        limit = limits[group]
+        if not await limit.acquire(settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000):
+            REQUESTS_SHED.labels(group, "overloaded").inc()
+            await rejected(503, 1, "Server busy, please retry")(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.release()
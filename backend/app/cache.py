@@ -0,0 +1,166 @@
+# backend/app/cache.py
+"""
+Per-process cache kept coherent across uvicorn workers with PostgreSQL LISTEN/NOTIFY.
+
+Writes call publish() inside their transaction; PostgreSQL delivers the NOTIFY
+on commit to every worker's listener thread, which evicts the named entries.
+The same listener connection can serve other channels (see app.order_events).
+"""
+import json
+import select
+import threading
+import time
+from typing import Any, Optional
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+CHANNEL = "cache_invalidation"
+
+
+class LocalCache:
+    """
+    Thread-safe TTL cache split into namespaces, e.g. ("product", product_id); keys are strings.
+
+    Fill it with the generation taken before the read, so a read that raced an
+    invalidation can't put the old value back:
+
+        generation = cache.generation()
+        value = load()
+        cache.set(namespace, key, value, generation=generation)
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._subscribers = {}
+        # Generation counter, and the generation each namespace / (namespace, key) was last invalidated at
+        self._generation = 0
+        self._cleared_at = 0
+        self._namespace_invalidated = {}
+        self._key_invalidated = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, namespace: str, callback):
+        """Call callback(key) whenever namespace is invalidated here or by another worker"""
+        with self._lock:
+            self._subscribers.setdefault(namespace, []).append(callback)
+
+    def get(self, namespace: str, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(namespace, {}).get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[namespace][key]
+                return None
+            return value
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, namespace: str, key: Any, value: Any, ttl: float = 300, generation: Optional[int] = None):
+        """Store value, unless the entry was invalidated after generation was taken"""
+        with self._lock:
+            if generation is not None and max(
+                self._cleared_at,
+                self._namespace_invalidated.get(namespace, 0),
+                self._key_invalidated.get((namespace, key), 0),
+            ) > generation:
+                return
+            self._data.setdefault(namespace, {})[key] = (value, time.monotonic() + ttl)
+
+    def invalidate(self, namespace: str, key: Any = None):
+        """Drop one entry, or the whole namespace when key is None"""
+        key = None if key is None else str(key)
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.pop(namespace, None)
+                self._namespace_invalidated[namespace] = self._generation
+            else:
+                self._data.get(namespace, {}).pop(key, None)
+                self._key_invalidated[(namespace, key)] = self._generation
+            callbacks = list(self._subscribers.get(namespace, []))
+        for callback in callbacks:
+            callback(key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._cleared_at = self._generation
+            self._data.clear()
+            callbacks = [callback for subscribed in self._subscribers.values() for callback in subscribed]
+        for callback in callbacks:
+            callback(None)
+
+
+cache = LocalCache()
+
+
+def publish(db: Session, *events):
+    """
+    Announce changes as (namespace, key) pairs, key None meaning the whole namespace.
+    Call before db.commit(): other workers are notified only if the write commits.
+    """
+    payloads = []
+    for namespace, key in events:
+        cache.invalidate(namespace, key)
+        payloads.append(json.dumps({"namespace": namespace, "key": None if key is None else str(key)}))
+    # One round trip for all of them
+    db.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": CHANNEL, "payloads": payloads}
+    )
+
+
+def evict(payload: Optional[str]):
+    if payload is None:
+        # Anything may have changed while we weren't listening
+        cache.clear()
+        return
+    event = json.loads(payload)
+    cache.invalidate(event["namespace"], event["key"])
+
+
+class InvalidationListener(threading.Thread):
+    """
+    Background thread holding a LISTEN connection and evicting on each NOTIFY.
+    handlers maps further channels to handler(payload); every handler is also
+    called with None on (re)connect, as notifications may have been missed.
+    """
+
+    def __init__(self, dsn: str, handlers: dict = None):
+        super().__init__(name="cache-invalidation", daemon=True)
+        self.dsn = dsn
+        self.handlers = {CHANNEL: evict, **(handlers or {})}
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_session(autocommit=True)
+                for channel in self.handlers:
+                    conn.cursor().execute(f"LISTEN {channel}")
+                for handler in self.handlers.values():
+                    handler(None)
+
+                while not self._stop_event.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.handlers[notify.channel](notify.payload)
+            except Exception as e:
+                print(f"⚠️  Cache invalidation listener error: {e}, reconnecting")
+                self._stop_event.wait(5)
+            finally:
+                if conn is not None:
+                    conn.close()
@@ -17,6 +17,36 @@ class Settings:
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "mkb-db")
     
     DATABASE_URL: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+    # Connection pool per worker. Admission control (app.admission) sizes its
+    # per-route concurrency limits from it, so requests queue there, not here.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+    # Admission control and load shedding
+    ADMISSION_CONTROL: bool = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+    ADMISSION_QUEUE_TIMEOUT_MS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "500"))
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "20"))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "40"))
+    # Reverse proxies in front of the app, each appending the address it saw to
+    # X-Forwarded-For; rate limits key on the entry that many from the right. Leave
+    # 0 (use the socket peer) unless every request really comes through them, or
+    # clients can spoof their address. Behind one load balancer: 1.
+    TRUSTED_PROXY_HOPS: int = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "100"))
+
+    # Read replicas for catalog/analytics reads: comma separated URLs, optional.
+    # For local testing any second PostgreSQL instance with the same schema works.
+    REPLICA_URLS: List[str] = [url.strip() for url in os.getenv("REPLICA_URLS", "").split(",") if url.strip()]
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_HEALTH_CHECK_SECONDS: float = float(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "5"))
+
+    # SQL instrumentation: slow-query log + N+1 detector (off by default)
+    SQL_INSTRUMENTATION: bool = os.getenv("SQL_INSTRUMENTATION", "false").lower() == "true"
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -31,6 +61,14 @@ class Settings:
         origins = [origin.strip().strip('"').strip("'") for origin in origins_str.strip("[]").split(",")]
         return origins
     
+    # How often units ordered are folded into Product.popularity (app.popularity)
+    POPULARITY_FOLD_SECONDS: float = float(os.getenv("POPULARITY_FOLD_SECONDS", "300"))
+    
+    # Orders partitioning: partitions kept ahead, how often that is checked, and where archived closed orders go
+    ORDER_PARTITIONS_AHEAD: int = int(os.getenv("ORDER_PARTITIONS_AHEAD", "3"))
+    ORDER_PARTITIONS_CHECK_HOURS: float = float(os.getenv("ORDER_PARTITIONS_CHECK_HOURS", "6"))
+    ORDER_ARCHIVE_DIR: str = os.getenv("ORDER_ARCHIVE_DIR", "archive/orders")
+    
     # File upload settings
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
     MAX_UPLOAD_SIZE: int = int(os.getenv("MAX_UPLOAD_SIZE", "5242880"))  # 5MB
@@ -1,8 +1,13 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
-from typing import Optional, List
-from . import models, schemas
+from sqlalchemy import or_, and_, func, true, text
+from typing import Optional, List, Dict
+from . import models, schemas, order_events
+from .cache import publish
+from .http_cache import bump_catalog_version
+from .order_ids import new_order_id, order_created_at
 import uuid
+from datetime import datetime
+import re
 
 
 # Product CRUD Operations
@@ -11,16 +16,105 @@ def get_product(db: Session, product_id: str) -> Optional[models.Product]:
     return db.query(models.Product).filter(models.Product.id == product_id).first()
 
 
+# Product.attributes keys offered as filters and facets
+FACET_ATTRIBUTES = ["material", "color", "work", "occasion"]
+
+# Listing sort orders. Each matches a (sort column, id) index, with or without a
+# leading category; id keeps offset paging stable when sort values tie.
+PRODUCT_SORTS = {
+    "newest": (models.Product.created_at.desc(), models.Product.id.desc()),
+    "price_asc": (models.Product.price.asc(), models.Product.id.asc()),
+    "price_desc": (models.Product.price.desc(), models.Product.id.desc()),
+    "popularity": (models.Product.popularity.desc(), models.Product.id.desc()),
+    "discount": (models.Product.discount_percent.desc(), models.Product.id.desc()),
+}
+
+
 def get_products(
     db: Session, 
     skip: int = 0, 
     limit: int = 100,
     category: Optional[str] = None,
     featured: Optional[bool] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    attributes: Optional[Dict[str, List[str]]] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: str = "newest"
 ) -> List[models.Product]:
-    query = db.query(models.Product)
-    
+    query = filter_products(
+        db.query(models.Product),
+        category=category,
+        featured=featured,
+        search=search,
+        attributes=attributes,
+        min_price=min_price,
+        max_price=max_price
+    )
+    return query.order_by(*PRODUCT_SORTS[sort]).offset(skip).limit(limit).all()
+
+
+def get_product_facets(
+    db: Session,
+    category: Optional[str] = None,
+    featured: Optional[bool] = None,
+    search: Optional[str] = None,
+    attributes: Optional[Dict[str, List[str]]] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None
+) -> Dict[str, List[dict]]:
+    """
+    Per-value counts of each facet attribute over the filtered products, in one query.
+    Each attribute is counted with every attribute filter except its own, so values
+    can still be added to a selection (they are OR'ed within an attribute).
+    """
+    kv = func.jsonb_each_text(models.Product.attributes).table_valued("key", "value").render_derived(name="kv")
+    selected = {key: values for key, values in (attributes or {}).items() if values}
+    counted = or_(*[
+        and_(kv.c.key == facet, *[
+            attribute_condition(key, values) for key, values in selected.items() if key != facet
+        ])
+        for facet in FACET_ATTRIBUTES
+    ])
+    count = func.count().filter(counted)
+
+    query = db.query(kv.c.key, kv.c.value, count.label("count"))\
+        .select_from(models.Product)\
+        .join(kv, true())\
+        .filter(kv.c.key.in_(FACET_ATTRIBUTES))
+    query = filter_products(
+        query,
+        category=category,
+        featured=featured,
+        search=search,
+        min_price=min_price,
+        max_price=max_price
+    )
+    rows = query.group_by(kv.c.key, kv.c.value)\
+        .having(count > 0)\
+        .order_by(kv.c.key, count.desc(), kv.c.value)\
+        .all()
+
+    facets = {key: [] for key in FACET_ATTRIBUTES}
+    for row in rows:
+        facets[row.key].append({"value": row.value, "count": row.count})
+    return facets
+
+
+def attribute_condition(key: str, values: List[str]):
+    # Each value is a JSONB containment test served by the GIN jsonb_path_ops index
+    return or_(*[models.Product.attributes.contains({key: value}) for value in values])
+
+
+def filter_products(
+    query,
+    category: Optional[str] = None,
+    featured: Optional[bool] = None,
+    search: Optional[str] = None,
+    attributes: Optional[Dict[str, List[str]]] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None
+):
     if category:
         query = query.filter(models.Product.category == category)
     
@@ -110,7 +204,19 @@ def get_products(
         
         query = query.filter(or_(*conditions))
     
-    return query.offset(skip).limit(limit).all()
+    # Attribute filters: OR within an attribute, AND across attributes
+    if attributes:
+        for key, values in attributes.items():
+            if values:
+                query = query.filter(attribute_condition(key, values))
+    
+    if min_price is not None:
+        query = query.filter(models.Product.price >= min_price)
+    
+    if max_price is not None:
+        query = query.filter(models.Product.price <= max_price)
+    
+    return query
 
 
 def create_product(db: Session, product: schemas.ProductCreate) -> models.Product:
@@ -131,6 +237,8 @@ def create_product(db: Session, product: schemas.ProductCreate) -> models.Produc
         attributes=product.attributes
     )
     db.add(db_product)
+    bump_catalog_version(db)
+    publish(db, ("product", product_id), ("products", None))
     db.commit()
     db.refresh(db_product)
     return db_product
@@ -145,6 +253,8 @@ def update_product(db: Session, product_id: str, product_update: schemas.Product
     for field, value in update_data.items():
         setattr(db_product, field, value)
     
+    bump_catalog_version(db)
+    publish(db, ("product", db_product.id), ("products", None), ("related", None))
     db.commit()
     db.refresh(db_product)
     return db_product
@@ -156,13 +266,26 @@ def delete_product(db: Session, product_id: str) -> bool:
         return False
     
     db.delete(db_product)
+    bump_catalog_version(db)
+    publish(db, ("product", db_product.id), ("products", None), ("related", None))
     db.commit()
     return True
 
 
 # Order CRUD Operations
+def normalize_phone(phone: str) -> str:
+    """Keep the last 10 digits, matching models.normalized_phone on the DB side"""
+    return re.sub(r"\D", "", phone or "")[-10:]
+
+
 def get_order(db: Session, order_id: str) -> Optional[models.Order]:
-    return db.query(models.Order).filter(models.Order.id == order_id).first()
+    query = db.query(models.Order).filter(models.Order.id == order_id)
+    # The partition key comes from the id, so this is one partition's primary key
+    # lookup; orders from before UUIDv7 ids probe every partition's index
+    created_at = order_created_at(order_id)
+    if created_at is not None:
+        query = query.filter(models.Order.created_at == created_at)
+    return query.first()
 
 
 def get_orders(
@@ -180,11 +303,12 @@ def get_orders(
 
 
 def create_order(db: Session, order: schemas.OrderCreate) -> models.Order:
-    # Generate a proper UUID v4 for orders too
-    order_id = str(uuid.uuid4())
+    # Time-ordered id that encodes created_at, so get_order can prune to one partition
+    order_id = new_order_id()
     
     db_order = models.Order(
-        id=order_id,  # Make sure your Order model has an id field of UUID type
+        id=order_id,
+        created_at=order_created_at(order_id),
         customer_name=order.customer_name,
         customer_phone=order.customer_phone,
         customer_email=order.customer_email,
@@ -197,6 +321,22 @@ def create_order(db: Session, order: schemas.OrderCreate) -> models.Order:
         message=order.message
     )
     db.add(db_order)
+    
+    # Units ordered for the popularity sort: append-only, folded into
+    # Product.popularity by app.popularity, so no product row is locked here
+    db.execute(
+        text("""
+            INSERT INTO popularity_deltas (product_id, quantity, created_at)
+            SELECT product_id, quantity, :created_at
+            FROM unnest(CAST(:product_ids AS uuid[]), CAST(:quantities AS integer[])) AS item(product_id, quantity)
+        """),
+        {
+            "product_ids": [str(item.product_id) for item in order.items],
+            "quantities": [item.quantity for item in order.items],
+            "created_at": datetime.utcnow()
+        }
+    )
+    order_events.record(db, "order_created", db_order)
     db.commit()
     db.refresh(db_order)
     return db_order
@@ -207,7 +347,23 @@ def update_order_status(db: Session, order_id: str, status: str) -> Optional[mod
     if not db_order:
         return None
     
+    previous_status = db_order.status
     db_order.status = status
+    if status != previous_status:
+        order_events.record(db, "order_status_changed", db_order)
     db.commit()
     db.refresh(db_order)
-    return db_order
\ No newline at end of file
+    return db_order
+
+
+def get_orders_by_phone(db: Session, phone: str, limit: int = 3) -> List[models.Order]:
+    # Served by ix_orders_customer_phone_norm (expression + created_at DESC)
+    phone = normalize_phone(phone)
+    if not phone:
+        return []
+
+    return db.query(models.Order)\
+        .filter(models.normalized_phone(models.Order.customer_phone) == phone)\
+        .order_by(models.Order.created_at.desc())\
+        .limit(limit)\
+        .all()
\ No newline at end of file
@@ -0,0 +1,87 @@
+# backend/app/customer_analytics.py
+"""
+Customer analytics over the full order history: RFM scores and monthly
+repeat-purchase cohorts, keyed by normalized customer_phone.
+
+Orders are streamed out once and everything is computed with vectorized
+NumPy group-bys. Results are stored as a snapshot row (one computation
+serves every worker) and cached per worker; POST /api/analytics/customers/refresh
+recomputes on demand.
+"""
+import time
+from datetime import datetime
+from typing import Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from . import models
+from .cache import cache, publish
+from .customer_scoring import rfm, repeat_cohorts
+
+SNAPSHOT_NAME = "customers"
+
+
+def export_orders(db: Session, batch_size: int = 20000):
+    """Stream (phone, created_at epoch, total) for non-cancelled orders into arrays"""
+    phones, timestamps, amounts = [], [], []
+    query = select(
+        models.normalized_phone(models.Order.customer_phone),
+        func.extract("epoch", models.Order.created_at),
+        models.Order.total_amount
+    )\
+        .where(models.Order.status != "cancelled")\
+        .where(models.Order.created_at.isnot(None))\
+        .execution_options(yield_per=batch_size)
+
+    for batch in db.execute(query).partitions():
+        phone, timestamp, amount = zip(*batch)
+        phones.append(np.array(phone, dtype=object))
+        timestamps.append(np.array(timestamp, dtype=np.float64))
+        amounts.append(np.array(amount, dtype=np.float64))
+
+    if not phones:
+        return np.array([], dtype=object), np.array([]), np.array([])
+    return np.concatenate(phones), np.concatenate(timestamps), np.concatenate(amounts)
+
+
+def compute(db: Session, cohort_months: int = 12) -> dict:
+    phones, timestamps, amounts = export_orders(db)
+    computed_at = datetime.utcnow()
+    if not len(phones):
+        return {"computed_at": computed_at.isoformat(), "rfm": None, "cohorts": []}
+
+    keys, customer = np.unique(phones, return_inverse=True)
+    return {
+        "computed_at": computed_at.isoformat(),
+        "rfm": rfm(customer, timestamps, amounts, len(keys), time.time()),
+        "cohorts": repeat_cohorts(customer, timestamps, len(keys), months=cohort_months),
+    }
+
+
+def refresh(db: Session) -> dict:
+    """Recompute, store the snapshot and evict the cached copy on every worker"""
+    payload = compute(db)
+    db.execute(
+        insert(models.AnalyticsSnapshot)
+        .values(name=SNAPSHOT_NAME, payload=payload, computed_at=datetime.utcnow())
+        .on_conflict_do_update(
+            index_elements=[models.AnalyticsSnapshot.name],
+            set_={"payload": payload, "computed_at": datetime.utcnow()}
+        )
+    )
+    publish(db, ("customer_analytics", SNAPSHOT_NAME))
+    db.commit()
+    return payload
+
+
+def get_snapshot(db: Session) -> Optional[dict]:
+    payload = cache.get("customer_analytics", SNAPSHOT_NAME)
+    if payload is None:
+        generation = cache.generation()
+        snapshot = db.query(models.AnalyticsSnapshot).filter(models.AnalyticsSnapshot.name == SNAPSHOT_NAME).first()
+        if snapshot is None:
+            return None
+        payload = snapshot.payload
+        cache.set("customer_analytics", SNAPSHOT_NAME, payload, ttl=3600, generation=generation)
+    return payload
@@ -0,0 +1,98 @@
+# backend/app/customer_scoring.py
+"""
+RFM scoring, segmentation and repeat-purchase cohorts for app.customer_analytics.
+Pure NumPy over per-order arrays, no database access.
+"""
+import numpy as np
+
+# (segment, rule on recency/frequency/monetary scores 1-5 and whether the customer
+# ordered more than once), first match wins. Scores are relative, so when most
+# customers order once that order count scores mid-range: "repeat" keeps one-order
+# customers out of the segments that mean coming back.
+SEGMENTS = [
+    ("champions", lambda r, f, m, repeat: (r >= 4) & (f >= 4) & repeat),
+    ("loyal", lambda r, f, m, repeat: (r >= 3) & (f >= 3) & repeat),
+    ("new", lambda r, f, m, repeat: (r >= 3) & ~repeat),
+    ("promising", lambda r, f, m, repeat: r >= 4),
+    ("at_risk", lambda r, f, m, repeat: (r <= 2) & (f >= 3) & repeat),
+    ("cant_lose", lambda r, f, m, repeat: (r <= 2) & (m >= 4)),
+    ("hibernating", lambda r, f, m, repeat: r <= 2),
+    ("needs_attention", lambda r, f, m, repeat: np.ones_like(r, dtype=bool)),
+]
+
+
+def quintile_scores(values: np.ndarray) -> np.ndarray:
+    """
+    Score 1-5 by the midpoint rank of each value. Tied values share the average of
+    the ranks they span, so a population where everyone ties scores 3, not 1.
+    """
+    unique, inverse = np.unique(values, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique))
+    below = np.cumsum(counts) - counts
+    # Midpoint rank below + (count - 1) / 2, scaled to 0-5, in integers
+    return (np.minimum((2 * below + counts - 1) * 5 // (2 * len(values)), 4) + 1)[inverse]
+
+
+def rfm(customer: np.ndarray, timestamps: np.ndarray, amounts: np.ndarray, customers: int, now: float):
+    last_order = np.full(customers, -np.inf)
+    np.maximum.at(last_order, customer, timestamps)
+    frequency = np.bincount(customer, minlength=customers)
+    monetary = np.bincount(customer, weights=amounts, minlength=customers)
+    recency_days = (now - last_order) / 86400
+
+    r = quintile_scores(-recency_days)
+    f = quintile_scores(frequency)
+    m = quintile_scores(monetary)
+
+    repeat = frequency > 1
+    segment = np.select([rule(r, f, m, repeat) for _, rule in SEGMENTS], np.arange(len(SEGMENTS)))
+    counts = np.bincount(segment, minlength=len(SEGMENTS))
+    revenue = np.bincount(segment, weights=monetary, minlength=len(SEGMENTS))
+
+    return {
+        "customers": int(customers),
+        "repeat_customers": int((frequency > 1).sum()),
+        "segments": [
+            {
+                "segment": name,
+                "customers": int(counts[i]),
+                "revenue": round(float(revenue[i]), 2),
+                "avg_recency_days": round(float(recency_days[segment == i].mean()), 1) if counts[i] else None,
+                "avg_orders": round(float(frequency[segment == i].mean()), 2) if counts[i] else None,
+            }
+            for i, (name, _) in enumerate(SEGMENTS)
+        ],
+    }
+
+
+def repeat_cohorts(customer: np.ndarray, timestamps: np.ndarray, customers: int, months: int = 12):
+    """Customers by first-order month, and how many of them ordered again N months later"""
+    order_month = timestamps.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+    first_month = np.full(customers, np.iinfo(np.int64).max)
+    np.minimum.at(first_month, customer, order_month)
+    offset = order_month - first_month[customer]
+
+    # Distinct (customer, month offset) pairs, then count per (cohort, offset)
+    span = int(offset.max()) + 1
+    active = np.unique(customer.astype(np.int64) * span + offset)
+    active_customer, active_offset = active // span, active % span
+    cohort = first_month[active_customer]
+
+    cohort_months = np.unique(first_month)[-months:]
+    cells = np.zeros((len(cohort_months), span), dtype=np.int64)
+    in_range = np.isin(cohort, cohort_months)
+    np.add.at(cells, (np.searchsorted(cohort_months, cohort[in_range]), active_offset[in_range]), 1)
+
+    result = []
+    for i, month in enumerate(cohort_months):
+        size = int(cells[i, 0])
+        # Offsets past the present are structurally empty, drop them
+        observed = int(order_month.max() - month) + 1
+        retained = cells[i, 1:observed]
+        result.append({
+            "cohort": str(np.datetime64(int(month), "M")),
+            "customers": size,
+            "repeat_customers": [int(count) for count in retained],
+            "repeat_rate": [round(float(count) / size, 4) for count in retained],
+        })
+    return result
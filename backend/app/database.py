@@ -1,13 +1,24 @@
 # backend/app/database.py
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .query_log import install_query_log
 
 print(f"🔗 Connecting to database: {settings.DATABASE_URL}")
 
 try:
-    engine = create_engine(settings.DATABASE_URL)
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
     # Test connection
     with engine.connect() as conn:
         print("✅ Database connection successful!")
@@ -22,13 +33,124 @@ except Exception as e:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Lag in seconds; 0 when fully replayed or when the server is not a standby at all
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        # Replicas must never block startup or hang a request, so connect lazily and fail fast
+        self.engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            connect_args={"connect_timeout": 2}
+        )
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.healthy = False
+        self.checked_at = 0.0
+
+    def check(self, max_lag_seconds: float):
+        try:
+            with self.engine.connect() as conn:
+                lag = float(conn.execute(REPLICA_LAG_SQL).scalar() or 0)
+            healthy = lag <= max_lag_seconds
+            if not healthy:
+                print(f"⚠️  Replica lagging {lag:.1f}s, reads fall back to primary")
+        except Exception as e:
+            healthy = False
+            print(f"⚠️  Replica health check failed: {e}")
+        self.healthy = healthy
+        self.checked_at = time.monotonic()
+
+    def mark_down(self):
+        self.healthy = False
+        self.checked_at = time.monotonic()
+
+
+class ReplicaRouter:
+    """Round-robins read-only sessions over healthy, caught-up replicas, else the primary"""
+
+    def __init__(self, urls, max_lag_seconds: float, check_interval: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def pick(self):
+        now = time.monotonic()
+        candidates = []
+        for replica in self.replicas:
+            if now - replica.checked_at >= self.check_interval:
+                # One request re-checks a stale replica; the rest use the last result
+                if self._lock.acquire(blocking=False):
+                    try:
+                        replica.check(self.max_lag_seconds)
+                    finally:
+                        self._lock.release()
+            if replica.healthy:
+                candidates.append(replica)
+        if not candidates:
+            return None
+        return candidates[next(self._counter) % len(candidates)]
+
+
+replicas = ReplicaRouter(
+    settings.REPLICA_URLS,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_HEALTH_CHECK_SECONDS,
+)
+if replicas.replicas:
+    print(f"📚 Routing catalog and analytics reads over {len(replicas.replicas)} replica(s)")
+
+report_queries = None
+if settings.SQL_INSTRUMENTATION:
+    for bind, session_factory in [(engine, SessionLocal)] + [(r.engine, r.SessionLocal) for r in replicas.replicas]:
+        report_queries = install_query_log(
+            bind,
+            session_factory,
+            slow_query_ms=settings.SLOW_QUERY_MS,
+            explain_slow=settings.SLOW_QUERY_EXPLAIN,
+            n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+        )
+    print(f"🔍 SQL instrumentation on: slow queries >= {settings.SLOW_QUERY_MS} ms, N+1 at {settings.N_PLUS_ONE_THRESHOLD} repeats")
+
 Base = declarative_base()
 
 
 # Dependency to get DB session
-def get_db():
+def get_db(request: Request = None):
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        if report_queries:
+            report_queries(db, f"{request.method} {request.url.path}" if request else "")
+        db.close()
+
+
+# Dependency for read-only routes: a replica session when one is healthy, else primary.
+# Never use it for writes.
+def get_read_db(request: Request = None):
+    replica = replicas.pick()
+    db = replica.SessionLocal() if replica else SessionLocal()
+    try:
+        yield db
+    except OperationalError:
+        # Lost the replica mid-request: stop routing to it until the next health check
+        if replica:
+            replica.mark_down()
+        raise
+    finally:
+        if report_queries:
+            report_queries(db, f"{request.method} {request.url.path}" if request else "")
+        db.close()
@@ -0,0 +1,119 @@
+# backend/app/http_cache.py
+"""
+Conditional requests and compression for catalog endpoints.
+
+The catalog version is a counter that product writes and the popularity batch
+job bump in their transaction (bump_catalog_version). Each request reads it once,
+by primary key, through its own session, so a 304 for an unchanged catalog costs
+one index lookup. Compressed bodies are memoized per (version, encoding, URL),
+so repeat 200s skip the query and the compression too.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+import brotli
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+MIN_COMPRESS_SIZE = 1024
+
+
+class BodyMemo:
+    """Small LRU of encoded response bodies; entries for old versions age out"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+memo = BodyMemo()
+
+
+CATALOG = "products"
+
+READ_CATALOG_VERSION_SQL = text("SELECT version FROM catalog_versions WHERE name = :name")
+
+BUMP_CATALOG_VERSION_SQL = text("""
+    INSERT INTO catalog_versions (name, version) VALUES (:name, 1)
+    ON CONFLICT (name) DO UPDATE SET version = catalog_versions.version + 1
+""")
+
+
+def bump_catalog_version(db: Session):
+    """Call in the transaction of any write that changes a listing, with publish(db, ("products", None))"""
+    db.execute(BUMP_CATALOG_VERSION_SQL, {"name": CATALOG})
+
+
+def read_catalog_version(db: Session) -> str:
+    return str(db.execute(READ_CATALOG_VERSION_SQL, {"name": CATALOG}).scalar() or 0)
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    accepted = set()
+    for part in accept_encoding.lower().replace(" ", "").split(","):
+        coding, _, params = part.partition(";")
+        if params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding)
+    if "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison: ignore W/ prefixes
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def catalog_response(request: Request, db: Session, load_body) -> Response:
+    """
+    Serve a catalog representation with a strong ETag, 304s and memoized compression.
+    load_body() reads through db and only runs on a memo miss; it returns the
+    uncompressed JSON bytes.
+    """
+    # Read before the body and through the same session, even a lagging replica's:
+    # the body is then at least as new as the version it is labelled and memoized with
+    version = read_catalog_version(db)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    headers = {"ETag": f'"{version}-{encoding}"', "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    memoized = memo.get((version, encoding, request.url.path, request.url.query))
+    if memoized is None:
+        body = load_body()
+        content_encoding = encoding if len(body) >= MIN_COMPRESS_SIZE else "identity"
+        memoized = (compress(body, content_encoding), content_encoding)
+        memo.set((version, encoding, request.url.path, request.url.query), memoized)
+
+    body, content_encoding = memoized
+    if content_encoding != "identity":
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,12 +1,21 @@
 # backend/app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from fastapi.staticfiles import StaticFiles
 import os
-from .routers import products, orders, upload
-from .database import engine
+from .routers import products, orders, upload, analytics, whatsapp
+from .database import engine, replicas
 from . import models
 from .config import settings
+from .metrics import metrics_middleware, install_sql_hooks, metrics_response
+from .admission import AdmissionMiddleware
+from .cache import InvalidationListener
+from . import order_events, popularity
+from .partitions import ensure_partitions
+from .maintenance import Maintenance
+from .suggestions import index as suggestion_index
 
 # Create tables
 try:
@@ -15,6 +24,12 @@ try:
 except Exception as e:
     print(f"⚠️  Error creating tables: {e}")
 
+# Monthly orders partitions must exist before orders land in them
+try:
+    ensure_partitions(engine, months_ahead=settings.ORDER_PARTITIONS_AHEAD)
+except Exception as e:
+    print(f"⚠️  Error creating order partitions: {e}")
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="E-commerce API for bridal wear and ornaments",
@@ -23,6 +38,19 @@ app = FastAPI(
     redoc_url="/api/redoc"
 )
 
+# Admission control: per-route concurrency limits sized to the pool, per-client
+# rate limits, fast 503s under overload. Added first so CORS headers still
+# reach browsers on 429/503.
+if settings.ADMISSION_CONTROL:
+    app.add_middleware(AdmissionMiddleware)
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # Pool exhausted despite admission control (e.g. other processes): shed, don't 500
+    return JSONResponse(status_code=503, content={"detail": "Server busy, please retry"}, headers={"Retry-After": "1"})
+
+
 # CORS middleware - FIXED
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +60,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus metrics: per-route latency, in-flight requests, SQL per request
+app.middleware("http")(metrics_middleware)
+install_sql_hooks(engine)
+for replica in replicas.replicas:
+    install_sql_hooks(replica.engine)
+
+# Cross-worker cache invalidation and the live order feed over LISTEN/NOTIFY
+invalidation_listener = InvalidationListener(
+    settings.DATABASE_URL,
+    handlers={order_events.CHANNEL: order_events.broker.dispatch}
+)
+
+
+@app.on_event("startup")
+def start_invalidation_listener():
+    invalidation_listener.start()
+    # First suggestion index build, in the background; /suggest serves an empty index until then
+    suggestion_index.start_rebuild()
+
+
+@app.on_event("shutdown")
+def stop_invalidation_listener():
+    invalidation_listener.stop()
+
+
+# Periodic jobs, each on one worker at a time. Checkout fails without a partition
+# for the current month, so keep creating them ahead however long we run.
+maintenance = Maintenance(engine)
+maintenance.every(
+    settings.ORDER_PARTITIONS_CHECK_HOURS * 3600,
+    "ensure_partitions",
+    lambda: ensure_partitions(engine, months_ahead=settings.ORDER_PARTITIONS_AHEAD)
+)
+# The popularity sort lags orders by at most this, and popularity_deltas stays small
+maintenance.every(settings.POPULARITY_FOLD_SECONDS, "fold_popularity", popularity.run, run_now=True)
+
+
+@app.on_event("startup")
+def start_maintenance():
+    maintenance.start()
+
+
+@app.on_event("shutdown")
+def stop_maintenance():
+    maintenance.stop()
+
+
 # Create upload directory if not exists
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
@@ -42,6 +117,8 @@ app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads"
 app.include_router(products.router, prefix="/api/products", tags=["products"])
 app.include_router(orders.router, prefix="/api/orders", tags=["orders"])
 app.include_router(upload.router, prefix="/api/upload", tags=["upload"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(whatsapp.router, prefix="/api", tags=["whatsapp"])
 
 
 @app.get("/")
@@ -54,6 +131,11 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
+
+
 @app.get("/config-test")
 async def config_test():
     """Test endpoint to verify config is working"""
@@ -0,0 +1,66 @@
+# backend/app/maintenance.py
+"""
+Periodic maintenance inside the API process, so it needs no external scheduler.
+
+Every worker runs the thread, but a job only runs where pg_try_advisory_lock on
+the job's name succeeds; other workers skip that round. Jobs run one after the
+other, so maintenance holds at most two pooled connections at a time: the lock
+connection and the job's own.
+"""
+import threading
+import time
+from sqlalchemy import text
+
+TRY_LOCK_SQL = text("SELECT pg_try_advisory_lock(hashtext(:name))")
+UNLOCK_SQL = text("SELECT pg_advisory_unlock(hashtext(:name))")
+
+# Pooled connections maintenance may hold at once; admission control keeps them free
+CONNECTIONS = 2
+
+
+class Maintenance(threading.Thread):
+    """Runs each job(), every interval seconds, on at most one worker at a time"""
+
+    def __init__(self, engine):
+        super().__init__(name="maintenance", daemon=True)
+        self.engine = engine
+        self.jobs = []  # [name, interval, job, next run]
+        self._stop_event = threading.Event()
+
+    def every(self, seconds: float, name: str, job, run_now: bool = False):
+        self.jobs.append([name, seconds, job, time.monotonic() + (0 if run_now else seconds)])
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run_exclusive(self, name: str, job) -> bool:
+        """Run job() holding the named advisory lock; False if another worker holds it"""
+        with self.engine.connect() as conn:
+            locked = conn.execute(TRY_LOCK_SQL, {"name": name}).scalar()
+            # Session-level lock: it outlives this transaction, which must not stay open
+            conn.commit()
+            if not locked:
+                return False
+            try:
+                job()
+            finally:
+                conn.execute(UNLOCK_SQL, {"name": name})
+                conn.commit()
+            return True
+
+    def run(self):
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            for entry in self.jobs:
+                name, interval, job, next_run = entry
+                if next_run > now or self._stop_event.is_set():
+                    continue
+                entry[3] = now + interval
+                try:
+                    self.run_exclusive(name, job)
+                except Exception as e:
+                    print(f"⚠️  Maintenance job {name} failed: {e}")
+            if self.jobs:
+                self._stop_event.wait(max(0, min(entry[3] for entry in self.jobs) - time.monotonic()))
+            else:
+                self._stop_event.wait()
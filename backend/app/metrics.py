@@ -0,0 +1,104 @@
+# backend/app/metrics.py
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request, Response
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+from sqlalchemy import event
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served",
+    multiprocess_mode="livesum",
+)
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total",
+    "Requests rejected by admission control, by route group and reason",
+    ["group", "reason"],
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed, by route", ["route"])
+DB_TIME = Counter("db_query_seconds_total", "Time spent in SQL statements, by route", ["route"])
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements issued by a single request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+# Per-request SQL tally, filled in by the engine hooks below. The dict is shared
+# with threadpool workers running sync routes, so updates are visible here.
+_request_sql: ContextVar[Optional[dict]] = ContextVar("request_sql", default=None)
+
+
+def route_label(request: Request) -> str:
+    # Use the route template so /api/products/{product_id} is one series, not one per product
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+async def metrics_middleware(request: Request, call_next):
+    if request.url.path == "/metrics":
+        return await call_next(request)
+
+    sql = {"queries": 0, "seconds": 0.0}
+    token = _request_sql.set(sql)
+    REQUESTS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        REQUESTS_IN_FLIGHT.dec()
+        _request_sql.reset(token)
+
+        route = route_label(request)
+        REQUEST_LATENCY.labels(request.method, route, status).observe(elapsed)
+        DB_QUERIES_PER_REQUEST.labels(route).observe(sql["queries"])
+        if sql["queries"]:
+            DB_QUERIES.labels(route).inc(sql["queries"])
+            DB_TIME.labels(route).inc(sql["seconds"])
+
+
+def install_sql_hooks(engine):
+    """Count statements and DB time against the request that issued them"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        sql = _request_sql.get()
+        if sql is not None:
+            sql["queries"] += 1
+            sql["seconds"] += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+def metrics_response() -> Response:
+    # With several uvicorn workers, PROMETHEUS_MULTIPROC_DIR makes /metrics aggregate all of them
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
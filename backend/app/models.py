@@ -1,5 +1,5 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime
+from sqlalchemy import Column, BigInteger, Integer, String, Float, Boolean, Text, DateTime, Index, Computed, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.sql import func
 import uuid
@@ -7,6 +7,11 @@ from .database import Base
 from datetime import datetime
 
 
+def normalized_phone(phone_column):
+    """Last 10 digits of a phone column, so '+91 88488-36951' matches '8848836951'"""
+    return func.right(func.regexp_replace(phone_column, '[^0-9]', '', 'g'), 10)
+
+
 class Product(Base):
     __tablename__ = "products"
     
@@ -21,9 +26,36 @@ class Product(Base):
     stock = Column(Integer, default=0)
     featured = Column(Boolean, default=False)
     attributes = Column(JSONB)  # material, color, work, weight, occasion
+    popularity = Column(Integer, nullable=False, default=0, server_default="0")  # units ordered
+    discount_percent = Column(Float, Computed(
+        "CASE WHEN original_price > price THEN (original_price - price) * 100 / original_price ELSE 0 END",
+        persisted=True
+    ))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # get_products: category filter with optional featured flag
+        Index("ix_products_category_featured", category, featured),
+        # Home page featured listing, a small slice of the catalog
+        Index("ix_products_featured", category, postgresql_where=(featured == True)),
+        # Dashboard low stock count
+        Index("ix_products_low_stock", stock, postgresql_where=(stock < 10)),
+        # Attribute filters (attributes @> '{"color": "Red"}') and facets
+        Index("ix_products_attributes", attributes, postgresql_using="gin",
+              postgresql_ops={"attributes": "jsonb_path_ops"}),
+        # Listing sort orders, with and without a category filter. id breaks ties so
+        # offset paging is stable; descending sorts scan these backwards.
+        Index("ix_products_category_created_at", category, created_at, id),
+        Index("ix_products_created_at", created_at, id),
+        Index("ix_products_category_price", category, price, id),  # also price range filters
+        Index("ix_products_price", price, id),
+        Index("ix_products_category_popularity", category, popularity, id),
+        Index("ix_products_popularity", popularity, id),
+        Index("ix_products_category_discount", category, discount_percent, id),
+        Index("ix_products_discount", discount_percent, id),
+    )
+
 
 class Order(Base):
     __tablename__ = "orders"
@@ -39,5 +71,68 @@ class Order(Base):
     total_amount = Column(Float, nullable=False)
     status = Column(String(20), default="pending")  # pending, confirmed, shipped, delivered
     message = Column(Text)
+    # Partition key, so part of the primary key (see app.partitions)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # get_orders newest first, analytics date ranges
+        Index("ix_orders_created_at", created_at.desc()),
+        # get_orders filtered by status, newest first
+        Index("ix_orders_status_created_at", status, created_at.desc()),
+        # WhatsApp order-status lookups: recent orders for a normalized phone
+        Index("ix_orders_customer_phone_norm", normalized_phone(customer_phone), created_at.desc()),
+        # Monthly range partitions, created ahead by app.partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class PopularityDelta(Base):
+    """
+    Units ordered, appended by create_order and folded into Product.popularity in
+    batch by app.popularity, so checkout never waits on a best-seller's row lock.
+    """
+    __tablename__ = "popularity_deltas"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    product_id = Column(UUID(as_uuid=True), nullable=False)
+    quantity = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+
+
+class CatalogVersion(Base):
+    """Counters bumped by writes that change a catalog listing, used as ETags by app.http_cache"""
+    __tablename__ = "catalog_versions"
+    
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+class ProductRecommendation(Base):
+    """Frequently-bought-together neighbours, rebuilt in batch by app.recommendations"""
+    __tablename__ = "product_recommendations"
+    
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    related_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=False)  # best first
+    scores = Column(ARRAY(Float), nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AnalyticsSnapshot(Base):
+    """Precomputed analytics payloads, e.g. customer RFM/cohorts from app.customer_analytics"""
+    __tablename__ = "analytics_snapshots"
+    
+    name = Column(String(50), primary_key=True)
+    payload = Column(JSONB, nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class OrderEvent(Base):
+    """Order-created / status-changed events for the live admin feed, see app.order_events"""
+    __tablename__ = "order_events"
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)  # SSE event id
+    type = Column(String(30), nullable=False)  # order_created, order_status_changed
+    order_id = Column(UUID(as_uuid=True), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
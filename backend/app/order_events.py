@@ -0,0 +1,166 @@
+# backend/app/order_events.py
+"""
+Live order feed for the admin panel over Server-Sent Events.
+
+crud.create_order and crud.update_order_status record an event row and NOTIFY
+it in the same transaction. Each worker's listener thread (app.cache) hands
+committed events to the broker, which pushes them to that worker's connected
+clients. A reconnecting client sends Last-Event-ID and first gets what it
+missed from order_events.
+
+Ids are drawn from the sequence at insert but become visible at commit, so a
+client can see id 12 before a slower transaction commits id 11. Replay therefore
+starts REPLAY_OVERLAP before the client's last event rather than after its id,
+and clients dedupe by event id. Old events are pruned from backend/ (e.g. daily):
+
+    python -m app.order_events prune --days 7
+"""
+import argparse
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from . import models
+from .database import SessionLocal
+
+CHANNEL = "order_events"
+REPLAY_LIMIT = 500
+# Longer than any order transaction, plus clock skew between workers
+REPLAY_OVERLAP = timedelta(seconds=60)
+QUEUE_SIZE = 100
+
+# The feed is exempt from admission control, so replays share one pooled
+# connection per worker (counted in admission.BACKGROUND_CONNECTIONS)
+replay_slot = threading.BoundedSemaphore(1)
+
+RECORD_EVENT_SQL = text("""
+    WITH event AS (
+        INSERT INTO order_events (type, order_id, payload, created_at)
+        VALUES (:type, :order_id, CAST(:payload AS jsonb), :created_at)
+        RETURNING id, type, payload
+    )
+    SELECT pg_notify(:channel, json_build_object('id', id, 'type', type, 'data', payload)::text)
+    FROM event
+""")
+
+
+def order_summary(order: models.Order) -> dict:
+    return {
+        "order_id": str(order.id),
+        "status": order.status,
+        "customer_name": order.customer_name,
+        "customer_city": order.customer_city,
+        "total_amount": order.total_amount,
+        "created_at": order.created_at.isoformat() if order.created_at else None,
+    }
+
+
+def record(db: Session, event_type: str, order: models.Order):
+    """Call before db.commit(): clients only hear about the event if the write commits"""
+    db.execute(RECORD_EVENT_SQL, {
+        "type": event_type,
+        "order_id": str(order.id),
+        "payload": json.dumps(order_summary(order)),
+        "created_at": datetime.utcnow(),
+        "channel": CHANNEL,
+    })
+
+
+def events_after(last_event_id: int, limit: int = REPLAY_LIMIT) -> List[dict]:
+    """
+    Events a reconnecting client may have missed, in id order, read from the primary.
+    Includes events from REPLAY_OVERLAP before last_event_id, some of which the client
+    already has. Past limit, or if last_event_id has been pruned, a single "reset"
+    event tells the client to reload the order list.
+    """
+    with replay_slot:
+        db = SessionLocal()
+        try:
+            last_created_at = db.query(models.OrderEvent.created_at)\
+                .filter(models.OrderEvent.id == last_event_id)\
+                .scalar()
+            rows = [] if last_created_at is None else db.query(models.OrderEvent)\
+                .filter(models.OrderEvent.created_at >= last_created_at - REPLAY_OVERLAP)\
+                .order_by(models.OrderEvent.id)\
+                .limit(limit + 1)\
+                .all()
+            if last_created_at is None or len(rows) > limit:
+                latest = db.query(func.max(models.OrderEvent.id)).scalar()
+                # No events left at all: nothing was missed
+                return [] if latest is None else [{"id": latest, "type": "reset", "data": {}}]
+            return [{"id": row.id, "type": row.type, "data": row.payload} for row in rows]
+        finally:
+            db.close()
+
+
+def prune(db: Session, days: int = 7) -> int:
+    deleted = db.query(models.OrderEvent)\
+        .filter(models.OrderEvent.created_at < datetime.utcnow() - timedelta(days=days))\
+        .delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+class OrderEventBroker:
+    """Fans events from the listener thread out to each connected client's asyncio queue"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers = {(loop, q) for loop, q in self._subscribers if q is not queue}
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, event: Optional[dict]):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Client can't keep up: end its stream, it resumes from Last-Event-ID
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def dispatch(self, payload: Optional[str]):
+        """Listener handler. None (listener reconnected) makes clients resume from the table"""
+        event = None if payload is None else json.loads(payload)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._put, queue, event)
+
+
+broker = OrderEventBroker()
+
+
+def format_event(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the live order feed's event log")
+    commands = parser.add_subparsers(dest="command", required=True)
+    prune_command = commands.add_parser("prune", help="delete events older than --days")
+    prune_command.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        deleted = prune(db, days=args.days)
+        print(f"✅ Pruned {deleted} order events older than {args.days} days")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
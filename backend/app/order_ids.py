@@ -0,0 +1,35 @@
+# backend/app/order_ids.py
+"""
+Order ids are UUIDv7: the first 48 bits are the creation time in milliseconds,
+so the id alone says which monthly partition holds the order (crud.get_order).
+The last 62 bits are random; the short reference shown to customers and admins
+is taken from there, as the time prefix is shared by every order in a minute.
+"""
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+def new_order_id() -> uuid.UUID:
+    """UUIDv7: 48-bit Unix time in ms, version, variant, random bits"""
+    value = (time.time_ns() // 1_000_000) << 80 | 0x7 << 76 | secrets.randbits(12) << 64 \
+        | 0b10 << 62 | secrets.randbits(62)
+    return uuid.UUID(int=value)
+
+
+def order_created_at(order_id) -> Optional[datetime]:
+    """created_at of an order with a UUIDv7 id; None for older random ids"""
+    try:
+        order_uuid = uuid.UUID(str(order_id))
+    except ValueError:
+        return None
+    if order_uuid.version != 7:
+        return None
+    return datetime(1970, 1, 1) + timedelta(milliseconds=order_uuid.int >> 80)
+
+
+def order_reference(order_id) -> str:
+    """Short reference for messages and lists: the last 8 hex digits (random in v4 and v7)"""
+    return str(order_id)[-8:].upper()
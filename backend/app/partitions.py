@@ -0,0 +1,167 @@
+# backend/app/partitions.py
+"""
+Monthly range partitions of orders on created_at, and archival of old closed orders.
+
+Queries bounded by created_at (dashboard, sales analytics) only touch the
+partitions they need, newest-first lists read partitions in order and stop at
+the limit, and get_order derives created_at from the order's UUIDv7 id. There
+is deliberately no default partition, as it would prevent that ordered read, so
+partitions must exist before orders land in them: they are created ahead on
+startup and every ORDER_PARTITIONS_CHECK_HOURS by app.maintenance. By hand, or
+to archive (e.g. monthly), from backend/:
+
+    python -m app.partitions ensure --months-ahead 3
+    python -m app.partitions archive --older-than 12
+
+Archiving moves delivered/cancelled orders from partitions entirely older than
+the cutoff to gzipped JSON lines files and drops partitions left empty. Open
+orders are never archived, however old.
+"""
+import argparse
+import gzip
+import os
+import re
+from datetime import date, datetime
+from sqlalchemy import bindparam, text
+from .config import settings
+from .database import engine as default_engine
+
+PARTITION_NAME = re.compile(r"^orders_(\d{4})_(\d{2})$")
+CLOSED_STATUSES = ("delivered", "cancelled")
+
+IS_PARTITIONED_SQL = text("""
+    SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('orders')
+""")
+
+PARTITIONS_SQL = text("""
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = to_regclass('orders')
+    ORDER BY child.relname
+""")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"orders_{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned(conn) -> bool:
+    return bool(conn.execute(IS_PARTITIONED_SQL).scalar())
+
+
+def ensure_partitions(engine=default_engine, months_ahead: int = 3, months_back: int = 0) -> list:
+    """Create any missing monthly partitions around the current month; returns those created"""
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            print("⚠️  orders is not partitioned, run migrations/005_partition_orders.sql")
+            return []
+        existing = {name for (name,) in conn.execute(PARTITIONS_SQL)}
+
+    this_month = date.today().replace(day=1)
+    created = []
+    for offset in range(-months_back, months_ahead + 1):
+        month = add_months(this_month, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        # One transaction each, so a failure only skips that month
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF orders "
+                    f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+                ))
+            created.append(name)
+        except Exception as e:
+            print(f"⚠️  Could not create partition {name}: {e}")
+    return created
+
+
+def archive_partition(engine, name: str, archive_dir: str, batch_size: int = 5000) -> int:
+    """
+    Move closed orders of one partition to a gzipped JSON lines file; drop the
+    partition if nothing is left in it. Returns the number of orders archived.
+    """
+    path = os.path.join(archive_dir, f"{name}_{datetime.utcnow():%Y%m%dT%H%M%S}.jsonl.gz")
+    # Rows are deleted in the same transaction they are written out from and only
+    # committed once the file is complete, so an order is never lost in between
+    delete_batch = text(f"""
+        DELETE FROM {name}
+        WHERE id IN (SELECT id FROM {name} WHERE status IN :statuses LIMIT :batch_size)
+        RETURNING row_to_json({name})::text
+    """).bindparams(bindparam("statuses", CLOSED_STATUSES, expanding=True), batch_size=batch_size)
+
+    archived = 0
+    with engine.begin() as conn:
+        with gzip.open(path, "wt", encoding="utf-8") as archive:
+            while True:
+                rows = conn.execute(delete_batch).scalars().all()
+                if not rows:
+                    break
+                archive.writelines(row + "\n" for row in rows)
+                archived += len(rows)
+
+        if not conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+            conn.execute(text(f"ALTER TABLE orders DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+
+    if not archived:
+        os.remove(path)
+    return archived
+
+
+def archive_closed_orders(engine=default_engine, older_than_months: int = 12, archive_dir: str = None) -> dict:
+    """Archive closed orders from every monthly partition ending before the cutoff"""
+    archive_dir = archive_dir or settings.ORDER_ARCHIVE_DIR
+    os.makedirs(archive_dir, exist_ok=True)
+    cutoff = add_months(date.today().replace(day=1), -older_than_months)
+
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            print("⚠️  orders is not partitioned, run migrations/005_partition_orders.sql")
+            return {}
+        names = [name for (name,) in conn.execute(PARTITIONS_SQL)]
+
+    results = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match is None:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(month, 1) <= cutoff:
+            results[name] = archive_partition(engine, name, archive_dir)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain monthly orders partitions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = commands.add_parser("ensure", help="create missing monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=settings.ORDER_PARTITIONS_AHEAD)
+    ensure.add_argument("--months-back", type=int, default=0)
+
+    archive = commands.add_parser("archive", help="archive closed orders from old partitions")
+    archive.add_argument("--older-than", type=int, default=12, help="months")
+    archive.add_argument("--archive-dir", default=settings.ORDER_ARCHIVE_DIR)
+
+    args = parser.parse_args()
+    if args.command == "ensure":
+        created = ensure_partitions(months_ahead=args.months_ahead, months_back=args.months_back)
+        print(f"✅ Created {len(created)} partition(s): {', '.join(created) or 'none needed'}")
+    else:
+        results = archive_closed_orders(older_than_months=args.older_than, archive_dir=args.archive_dir)
+        for name, count in results.items():
+            print(f"✅ {name}: archived {count} closed orders")
+        if not results:
+            print("✅ No partitions older than the cutoff")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# backend/app/popularity.py
+"""
+Fold units ordered into Product.popularity.
+
+create_order only appends to popularity_deltas; this batch job moves the
+deltas into products in one statement, so each product row is written once per
+run instead of once per order. app.maintenance runs it every
+POPULARITY_FOLD_SECONDS on one worker; to run it by hand, from backend/:
+
+    python -m app.popularity
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from .cache import publish
+from .http_cache import bump_catalog_version
+from .database import SessionLocal
+
+FOLD_POPULARITY_SQL = text("""
+    WITH folded AS (
+        DELETE FROM popularity_deltas RETURNING product_id, quantity
+    ), units AS (
+        SELECT product_id, sum(quantity) AS quantity FROM folded GROUP BY product_id
+    )
+    UPDATE products SET popularity = products.popularity + units.quantity
+    FROM units
+    WHERE products.id = units.product_id
+""")
+
+
+def fold_popularity(db: Session) -> int:
+    """Apply pending deltas; returns the number of products updated"""
+    updated = db.execute(FOLD_POPULARITY_SQL).rowcount
+    if updated:
+        # One new catalog version per run, not per order
+        bump_catalog_version(db)
+        publish(db, ("products", None))
+    db.commit()
+    return updated
+
+
+def run() -> int:
+    db = SessionLocal()
+    try:
+        return fold_popularity(db)
+    finally:
+        db.close()
+
+
+def main():
+    print(f"✅ Updated popularity of {run()} products")
+
+
+if __name__ == "__main__":
+    main()
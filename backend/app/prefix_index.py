@@ -0,0 +1,227 @@
+# backend/app/prefix_index.py
+"""
+The in-memory index behind app.suggestions. It has no database access of its
+own: product rows come from the load_products function it is given.
+"""
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import List
+from sqlalchemy.orm import Session
+
+REBUILD_SECONDS = 600
+MAX_WORDS = 5
+MIN_QUERY_COUNT = 3
+MAX_TRACKED_QUERIES = 10000
+MAX_MEMO_ENTRIES = 4096
+
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text.lower()).strip()
+
+
+def index_keys(text: str) -> List[str]:
+    words = normalize(text).split(" ")[:MAX_WORDS]
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+class PrefixIndex:
+    """
+    Entries are keyed "product:<id>", "sub_category:<name>" or "query:<text>" and
+    weighted by units sold (products, summed per sub-category) or search count.
+    """
+
+    def __init__(self):
+        self.keys = []  # sorted (index key, entry key)
+        self.entries = {}  # entry key -> (weight, suggestion dict)
+        self.products = {}  # product id -> (name, sub_category, popularity)
+        self.sub_categories = {}  # normalized name -> [display name, products, weight]
+
+    @classmethod
+    def build(cls, rows, queries) -> "PrefixIndex":
+        index = cls()
+        # Collect unsorted, then sort once rather than insort per key
+        keys = []
+        for product_id, name, sub_category, popularity in rows:
+            product_id = str(product_id)
+            index.products[product_id] = (name, sub_category, popularity or 0)
+            index.entries[f"product:{product_id}"] = (
+                popularity or 0, {"text": name, "type": "product", "product_id": product_id}
+            )
+            keys.extend((key, f"product:{product_id}") for key in index_keys(name))
+            if sub_category:
+                entry = index.sub_categories.setdefault(normalize(sub_category), [sub_category, 0, 0])
+                entry[1] += 1
+                entry[2] += popularity or 0
+        for normalized, (display, _, weight) in index.sub_categories.items():
+            index.entries[f"sub_category:{normalized}"] = (
+                weight, {"text": display, "type": "sub_category", "product_id": None}
+            )
+            keys.extend((key, f"sub_category:{normalized}") for key in index_keys(display))
+        for query, count in queries:
+            index.entries[f"query:{query}"] = (count, {"text": query, "type": "query", "product_id": None})
+            keys.extend((key, f"query:{query}") for key in index_keys(query))
+        keys.sort()
+        index.keys = keys
+        return index
+
+    def _add(self, entry_key: str, text: str, weight: float, suggestion: dict):
+        self.entries[entry_key] = (weight, suggestion)
+        for key in index_keys(text):
+            insort(self.keys, (key, entry_key))
+
+    def _remove(self, entry_key: str, text: str):
+        if self.entries.pop(entry_key, None) is None:
+            return
+        for key in index_keys(text):
+            position = bisect_left(self.keys, (key, entry_key))
+            if position < len(self.keys) and self.keys[position] == (key, entry_key):
+                del self.keys[position]
+
+    def _set_sub_category(self, name: str, delta_products: int, delta_weight: float):
+        normalized = normalize(name)
+        entry_key = f"sub_category:{normalized}"
+        display, products, weight = self.sub_categories.get(normalized, [name, 0, 0])
+        self._remove(entry_key, display)
+        products, weight = products + delta_products, weight + delta_weight
+        if products > 0:
+            self.sub_categories[normalized] = [display, products, weight]
+            self._add(entry_key, display, weight, {"text": display, "type": "sub_category", "product_id": None})
+        else:
+            self.sub_categories.pop(normalized, None)
+
+    def put_product(self, product_id: str, row):
+        """Replace a product's entries with row (name, sub_category, popularity); None removes it"""
+        old = self.products.pop(product_id, None)
+        if old is not None:
+            name, sub_category, popularity = old
+            self._remove(f"product:{product_id}", name)
+            if sub_category:
+                self._set_sub_category(sub_category, -1, -popularity)
+        if row is not None:
+            name, sub_category, popularity = row
+            self.products[product_id] = row
+            self._add(f"product:{product_id}", name, popularity,
+                      {"text": name, "type": "product", "product_id": product_id})
+            if sub_category:
+                self._set_sub_category(sub_category, 1, popularity)
+
+    def lookup(self, prefix: str, limit: int) -> List[dict]:
+        start = bisect_left(self.keys, (prefix,))
+        end = bisect_left(self.keys, (prefix + "￿",), lo=start)
+        matched = {entry_key for _, entry_key in self.keys[start:end]}
+        best = heapq.nsmallest(limit, matched, key=lambda entry_key: (-self.entries[entry_key][0], entry_key))
+        return [self.entries[entry_key][1] for entry_key in best]
+
+
+class SuggestionIndex:
+    """
+    Serves lookups from the current PrefixIndex while a replacement is built in the
+    background. load_products(db, product_ids=None) returns (id, name, sub_category,
+    popularity) rows of every product, or only of product_ids; builds read through
+    their own session_factory() session.
+    """
+
+    def __init__(self, session_factory, load_products):
+        self.session_factory = session_factory
+        self.load_products = load_products
+        self._lock = threading.Lock()
+        self._index = PrefixIndex()
+        self._memo = {}
+        self._built_at = None
+        self._rebuilding = False
+        self._resets = 0
+        self._pending = set()
+        self._changed_during_rebuild = set()
+        self._queries = Counter()
+
+    # Invalidation bus callbacks, possibly on the listener thread: just record the work
+    def product_changed(self, key):
+        with self._lock:
+            if key is None:
+                self._resets += 1
+                self._built_at = None
+            else:
+                self._pending.add(str(key))
+                if self._rebuilding:
+                    self._changed_during_rebuild.add(str(key))
+
+    def record_query(self, query: str):
+        query = normalize(query)
+        if not query:
+            return
+        with self._lock:
+            self._queries[query] += 1
+            if len(self._queries) > MAX_TRACKED_QUERIES:
+                self._queries = Counter(dict(self._queries.most_common(MAX_TRACKED_QUERIES // 2)))
+
+    def rebuild(self):
+        """Build a new index from the primary and swap it in; runs on a background thread"""
+        try:
+            with self._lock:
+                # Writes from here on may be missing from the rows read below, so they
+                # are applied again on top of the new index once it is swapped in
+                self._pending.clear()
+                self._changed_during_rebuild = set()
+                resets = self._resets
+                queries = [(query, count) for query, count in self._queries.items() if count >= MIN_QUERY_COUNT]
+            db = self.session_factory()
+            try:
+                rows = self.load_products(db)
+            finally:
+                db.close()
+            index = PrefixIndex.build(rows, queries)
+            with self._lock:
+                self._index = index
+                self._memo = {}
+                self._pending |= self._changed_during_rebuild
+                # A reconnect during the build may have missed writes: build again
+                self._built_at = time.monotonic() if resets == self._resets else None
+        except Exception as e:
+            print(f"⚠️  Suggestion index rebuild failed: {e}")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                self._changed_during_rebuild = set()
+
+    def start_rebuild(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self.rebuild, name="suggestion-index", daemon=True).start()
+
+    def _apply_pending(self, db: Session):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        rows = {
+            str(product_id): (name, sub_category, popularity or 0)
+            for product_id, name, sub_category, popularity in self.load_products(db, pending)
+        }
+        with self._lock:
+            # Deleted products are pending but have no row
+            for product_id in pending:
+                self._index.put_product(product_id, rows.get(product_id))
+            self._memo = {}
+
+    def suggest(self, db: Session, prefix: str, limit: int = 10) -> List[dict]:
+        prefix = normalize(prefix)
+        if not prefix:
+            # Whitespace only: matches everything, suggests nothing useful
+            return []
+        if self._built_at is None or time.monotonic() - self._built_at > REBUILD_SECONDS:
+            self.start_rebuild()
+        if self._pending:
+            self._apply_pending(db)
+
+        with self._lock:
+            memoized = self._memo.get((prefix, limit))
+            if memoized is None:
+                memoized = self._index.lookup(prefix, limit)
+                if len(self._memo) >= MAX_MEMO_ENTRIES:
+                    self._memo = {}
+                self._memo[(prefix, limit)] = memoized
+            return memoized
@@ -0,0 +1,92 @@
+# backend/app/query_log.py
+"""
+Opt-in SQL instrumentation (SQL_INSTRUMENTATION=true):
+
+- slow-query log: statements slower than SLOW_QUERY_MS are logged with their
+  parameters and, for SELECTs, the EXPLAIN plan
+- N+1 detector: when a session issues the same statement (ignoring parameter
+  values) N_PLUS_ONE_THRESHOLD or more times, it is reported when the session closes
+"""
+import logging
+import re
+import time
+from collections import Counter
+from sqlalchemy import event
+
+logger = logging.getLogger("app.sql")
+
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse parameters, literals and IN-lists so near-identical statements compare equal"""
+    statement = _PARAM.sub("?", statement)
+    statement = _IN_LIST.sub("(?)", statement)
+    return _SPACE.sub(" ", statement).strip()
+
+
+def explain(dbapi_connection, statement, parameters) -> str:
+    # Fresh cursor: psycopg2 has already buffered the original result set.
+    # The savepoint keeps a failing EXPLAIN from aborting the caller's transaction.
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT query_log_explain")
+        try:
+            cursor.execute("EXPLAIN " + statement, parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            cursor.execute("RELEASE SAVEPOINT query_log_explain")
+            return plan
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT query_log_explain")
+            return f"EXPLAIN failed: {e}"
+    finally:
+        cursor.close()
+
+
+def install_query_log(engine, session_factory, slow_query_ms: float, explain_slow: bool, n_plus_one_threshold: int):
+    @event.listens_for(session_factory, "after_begin")
+    def after_begin(session, transaction, connection):
+        # Route this connection's statements to the session's tally
+        connection.info["query_log"] = session.info.setdefault("query_log", Counter())
+
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        connection_record.info.pop("query_log", None)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_log_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_log_start"].pop()) * 1000
+
+        tally = conn.info.get("query_log")
+        if tally is not None:
+            tally[normalize_statement(statement)] += 1
+
+        if elapsed_ms >= slow_query_ms:
+            message = f"Slow query ({elapsed_ms:.1f} ms): {statement}\nParameters: {parameters!r}"
+            if explain_slow and not executemany and statement.lstrip().upper().startswith("SELECT"):
+                message += "\n" + explain(cursor.connection, statement, parameters)
+            logger.warning(message)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_log_start"):
+            conn.info["query_log_start"].pop()
+
+    def report(session, label: str = ""):
+        """Log statements this session repeated often enough to look like N+1 queries"""
+        tally = session.info.pop("query_log", None)
+        if not tally:
+            return
+        for statement, count in tally.most_common():
+            if count < n_plus_one_threshold:
+                break
+            logger.warning(f"Possible N+1{' in ' + label if label else ''}: {count}x {statement}")
+
+    return report
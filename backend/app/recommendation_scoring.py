@@ -0,0 +1,40 @@
+# backend/app/recommendation_scoring.py
+"""
+Co-purchase scoring for app.recommendations.
+Pure sparse matrix algebra over an orders x products matrix, no database access.
+"""
+import numpy as np
+from scipy import sparse
+
+
+def top_neighbours(orders: sparse.csr_matrix, top_n: int = 10, min_support: int = 2):
+    """
+    For each product, the top_n products most often bought with it.
+
+    Scores are co-purchase counts normalised by both products' order counts
+    (cosine similarity), so best sellers don't top every list. Pairs bought
+    together fewer than min_support times are dropped as noise.
+    """
+    co_counts = (orders.T @ orders).tocsr()
+    co_counts.setdiag(0)
+    co_counts.data[co_counts.data < min_support] = 0
+    co_counts.eliminate_zeros()
+
+    frequency = np.asarray(orders.sum(axis=0)).ravel()
+    inverse_norms = sparse.diags(1 / np.sqrt(frequency))
+    scores = (inverse_norms @ co_counts @ inverse_norms).tocsr()
+
+    neighbours = []
+    for row in range(scores.shape[0]):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        if start == end:
+            neighbours.append(([], []))
+            continue
+        data = scores.data[start:end]
+        columns = scores.indices[start:end]
+        if len(data) > top_n:
+            keep = np.argpartition(-data, top_n)[:top_n]
+            data, columns = data[keep], columns[keep]
+        order = np.argsort(-data, kind="stable")
+        neighbours.append((columns[order].tolist(), data[order].tolist()))
+    return neighbours
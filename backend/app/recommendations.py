@@ -0,0 +1,127 @@
+# backend/app/recommendations.py
+"""
+"Frequently bought together" recommendations.
+
+A batch job builds the product co-occurrence matrix from order items with
+sparse matrix algebra and stores the top-N neighbours of every product in
+product_recommendations. Run it from backend/ (e.g. nightly):
+
+    python -m app.recommendations --top-n 10
+"""
+import argparse
+import uuid
+from datetime import datetime
+from typing import List
+import numpy as np
+from scipy import sparse
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from . import models
+from .cache import publish
+from .database import SessionLocal
+from .recommendation_scoring import top_neighbours
+
+
+def load_order_matrix(db: Session, batch_size: int = 5000):
+    """Stream order items into a binary orders x products CSR matrix"""
+    product_index = {}
+    rows, cols = [], []
+    order_count = 0
+
+    query = db.query(models.Order.items)\
+        .filter(models.Order.status != "cancelled")\
+        .yield_per(batch_size)
+    for (items,) in query:
+        seen = set()
+        for item in items or []:
+            try:
+                product_id = uuid.UUID(str(item["product_id"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+            column = product_index.setdefault(product_id, len(product_index))
+            if column not in seen:
+                seen.add(column)
+                rows.append(order_count)
+                cols.append(column)
+        if seen:
+            order_count += 1
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+        shape=(order_count, len(product_index)),
+    )
+    product_ids = [None] * len(product_index)
+    for product_id, column in product_index.items():
+        product_ids[column] = product_id
+    return matrix, product_ids
+
+
+def build_recommendations(db: Session, top_n: int = 10, min_support: int = 2) -> int:
+    """Recompute and replace product_recommendations; returns products with recommendations"""
+    orders, product_ids = load_order_matrix(db)
+    if not product_ids:
+        return 0
+
+    # Orders can reference products deleted since; they must not be stored or suggested
+    existing = {product_id for (product_id,) in db.query(models.Product.id)}
+
+    computed_at = datetime.utcnow()
+    rows = []
+    for column, (neighbour_columns, scores) in enumerate(top_neighbours(orders, top_n, min_support)):
+        if product_ids[column] not in existing:
+            continue
+        related = [
+            (product_ids[c], score) for c, score in zip(neighbour_columns, scores)
+            if product_ids[c] in existing
+        ]
+        if related:
+            rows.append({
+                "product_id": product_ids[column],
+                "related_ids": [product_id for product_id, _ in related],
+                "scores": [score for _, score in related],
+                "computed_at": computed_at,
+            })
+
+    db.query(models.ProductRecommendation).delete()
+    if rows:
+        db.execute(insert(models.ProductRecommendation), rows)
+    publish(db, ("related", None))
+    db.commit()
+    return len(rows)
+
+
+RELATED_PRODUCTS_SQL = text("""
+    SELECT p.*
+    FROM product_recommendations r
+    CROSS JOIN LATERAL unnest(r.related_ids) WITH ORDINALITY AS related(product_id, rank)
+    JOIN products p ON p.id = related.product_id
+    WHERE r.product_id = :product_id
+    ORDER BY related.rank
+    LIMIT :limit
+""")
+
+
+def get_related_products(db: Session, product_id: str, limit: int = 10) -> List[models.Product]:
+    # One statement: primary-key read of the precomputed list, then primary-key
+    # lookups of its products. Products deleted since the last build drop out.
+    return db.query(models.Product)\
+        .from_statement(RELATED_PRODUCTS_SQL.bindparams(product_id=product_id, limit=limit))\
+        .all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild frequently-bought-together recommendations")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--min-support", type=int, default=2, help="minimum times a pair was bought together")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = build_recommendations(db, top_n=args.top_n, min_support=args.min_support)
+        print(f"✅ Stored recommendations for {count} products")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
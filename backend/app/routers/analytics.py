@@ -1,17 +1,21 @@
 # backend/app/routers/analytics.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, case
-from datetime import datetime, timedelta
-from typing import Dict, Any
-from ..database import get_db
-from .. import models
+from sqlalchemy import func, extract, case, text
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from ..database import get_db, get_read_db
+from .. import models, customer_analytics
 
 router = APIRouter()
 
+# Plain def, like the other analytics endpoints: the aggregates block, so they run
+# in the threadpool rather than on the event loop
 @router.get("/dashboard-stats")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get overall dashboard statistics"""
+def get_dashboard_stats(tz: str = "Asia/Kolkata", db: Session = Depends(get_read_db)):
+    """Get overall dashboard statistics; "today" is the current day in tz"""
+    zone = parse_zone(tz)
     
     # Total products
     total_products = db.query(func.count(models.Product.id)).scalar()
@@ -22,10 +26,12 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
     # Total revenue
     total_revenue = db.query(func.sum(models.Order.total_amount)).scalar() or 0
     
-    # Today's orders
-    today = datetime.now().date()
+    # Today's orders: local midnight to midnight as a UTC created_at range (the
+    # stored timezone), so ix_orders_created_at applies
+    today = datetime.now(zone).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
     today_orders = db.query(func.count(models.Order.id))\
-        .filter(func.date(models.Order.created_at) == today)\
+        .filter(models.Order.created_at >= to_utc(today, zone))\
+        .filter(models.Order.created_at < to_utc(today + timedelta(days=1), zone))\
         .scalar()
     
     # Low stock products
@@ -41,58 +47,165 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
         "low_stock_products": low_stock
     }
 
+# Lookback used when no explicit start is given
+PERIODS = {
+    "day": timedelta(days=1),
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+# Bucket interval -> (generate_series step, approximate size for the bucket cap)
+INTERVALS = {
+    "hour": ("1 hour", timedelta(hours=1)),
+    "day": ("1 day", timedelta(days=1)),
+    "week": ("1 week", timedelta(weeks=1)),
+    "month": ("1 month", timedelta(days=28)),
+}
+MAX_BUCKETS = 1000
+
+# Current and previous period in one pass over one created_at range (index range
+# scan on UTC bounds). Buckets are in the requested timezone; previous-period
+# orders are shifted forward by the period length onto the current buckets, and
+# generate_series fills buckets with no orders.
+SALES_SERIES_SQL = text("""
+    WITH buckets AS (
+        SELECT generate_series(date_trunc(:interval, :start_local), :last_local, CAST(:step AS interval)) AS bucket
+    ),
+    sales AS (
+        SELECT
+            (created_at AT TIME ZONE 'UTC') AT TIME ZONE :tz AS local_ts,
+            total_amount
+        FROM orders
+        WHERE created_at >= :previous_start_utc AND created_at < :end_utc
+    ),
+    totals AS (
+        SELECT
+            date_trunc(:interval, CASE WHEN local_ts >= :start_local THEN local_ts ELSE local_ts + :shift END) AS bucket,
+            local_ts >= :start_local AS is_current,
+            count(*) AS orders,
+            sum(total_amount) AS revenue
+        FROM sales
+        GROUP BY 1, 2
+    )
+    SELECT
+        b.bucket,
+        COALESCE(c.orders, 0) AS orders,
+        COALESCE(c.revenue, 0) AS revenue,
+        COALESCE(p.orders, 0) AS previous_orders,
+        COALESCE(p.revenue, 0) AS previous_revenue
+    FROM buckets b
+    LEFT JOIN totals c ON c.bucket = b.bucket AND c.is_current
+    LEFT JOIN totals p ON p.bucket = b.bucket AND NOT p.is_current
+    ORDER BY b.bucket
+""")
+
+TOP_PRODUCTS_SQL = text("""
+    SELECT p.name, count(*) AS sales
+    FROM orders o
+    CROSS JOIN LATERAL jsonb_array_elements(o.items) AS item
+    JOIN products p ON p.id = (item->>'product_id')::uuid
+    WHERE o.created_at >= :start_utc AND o.created_at < :end_utc
+    GROUP BY p.id, p.name
+    ORDER BY sales DESC
+    LIMIT 10
+""")
+
+# Orders and item revenue per product category. An order counts once in each
+# category it has items in; revenue is that category's items, not the order total.
+CATEGORY_SALES_SQL = text("""
+    SELECT
+        p.category,
+        count(DISTINCT o.id) AS sales,
+        sum((item->>'price')::numeric * (item->>'quantity')::integer) AS revenue
+    FROM orders o
+    CROSS JOIN LATERAL jsonb_array_elements(o.items) AS item
+    JOIN products p ON p.id = (item->>'product_id')::uuid
+    GROUP BY p.category
+    ORDER BY p.category
+""")
+
+
+def to_local(value: datetime, zone: ZoneInfo) -> datetime:
+    """Naive local time in zone; naive input is taken as already local"""
+    return value.astimezone(zone).replace(tzinfo=None) if value.tzinfo else value
+
+
+def to_utc(local: datetime, zone: ZoneInfo) -> datetime:
+    """Naive UTC, matching how created_at is stored"""
+    return local.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_zone(tz: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: '{tz}'")
+
+
+# Plain def: the two heavy queries run in the threadpool, not on the event loop
 @router.get("/sales-analytics")
-async def get_sales_analytics(
-    period: str = "month",  # day, week, month, year
-    db: Session = Depends(get_db)
+def get_sales_analytics(
+    period: str = "month",  # day, week, month, year: lookback when start is not given
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    tz: str = "Asia/Kolkata",
+    interval: Optional[str] = None,  # hour, day, week, month; picked from the range if omitted
+    db: Session = Depends(get_read_db)
 ):
-    """Get sales analytics for charts"""
+    """Get sales analytics for charts, with the previous period for comparison"""
+    zone = parse_zone(tz)
+    if period not in PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of {list(PERIODS)}")
+    if interval is not None and interval not in INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of {list(INTERVALS)}")
     
-    end_date = datetime.now()
+    end_local = to_local(end, zone) if end else datetime.now(zone).replace(tzinfo=None)
+    start_local = to_local(start, zone) if start else end_local - PERIODS[period]
+    if start_local >= end_local:
+        raise HTTPException(status_code=400, detail="start must be before end")
     
-    if period == "day":
-        start_date = end_date - timedelta(days=1)
-        interval = "hour"
-    elif period == "week":
-        start_date = end_date - timedelta(days=7)
-        interval = "day"
-    elif period == "month":
-        start_date = end_date - timedelta(days=30)
-        interval = "day"
-    else:  # year
-        start_date = end_date - timedelta(days=365)
-        interval = "month"
+    length = end_local - start_local
+    if interval is None:
+        interval = "hour" if length <= timedelta(days=2) else "day" if length <= timedelta(days=92) else "month"
+    step, bucket_size = INTERVALS[interval]
+    if length / bucket_size > MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Range too long for {interval} buckets (max {MAX_BUCKETS})")
     
-    # Get orders in period
-    orders = db.query(
-        func.date_trunc(interval, models.Order.created_at).label('period'),
-        func.count(models.Order.id).label('orders'),
-        func.sum(models.Order.total_amount).label('revenue')
-    )\
-    .filter(models.Order.created_at.between(start_date, end_date))\
-    .group_by('period')\
-    .order_by('period')\
-    .all()
+    previous_start_local = start_local - length
+    series = db.execute(SALES_SERIES_SQL, {
+        "interval": interval,
+        "step": step,
+        "tz": tz,
+        "start_local": start_local,
+        "last_local": end_local - timedelta(microseconds=1),
+        "shift": length,
+        "previous_start_utc": to_utc(previous_start_local, zone),
+        "end_utc": to_utc(end_local, zone),
+    }).all()
     
-    # Get top selling products
-    top_products = db.query(
-        models.Product.name,
-        func.count(models.Order.id).label('sales')
-    )\
-    .join(models.Order, models.Order.items.contains(models.Product.id))\
-    .group_by(models.Product.id, models.Product.name)\
-    .order_by(func.count(models.Order.id).desc())\
-    .limit(10)\
-    .all()
+    top_products = db.execute(TOP_PRODUCTS_SQL, {
+        "start_utc": to_utc(start_local, zone),
+        "end_utc": to_utc(end_local, zone),
+    }).all()
     
     return {
+        "range": {
+            "start": start_local.isoformat(),
+            "end": end_local.isoformat(),
+            "previous_start": previous_start_local.isoformat(),
+            "previous_end": start_local.isoformat(),
+            "timezone": tz,
+            "interval": interval
+        },
         "sales_data": [
             {
-                "period": order.period.isoformat(),
-                "orders": order.orders,
-                "revenue": float(order.revenue or 0)
+                "period": row.bucket.isoformat(),
+                "orders": row.orders,
+                "revenue": float(row.revenue or 0),
+                "previous_orders": row.previous_orders,
+                "previous_revenue": float(row.previous_revenue or 0)
             }
-            for order in orders
+            for row in series
         ],
         "top_products": [
             {"name": product.name, "sales": product.sales}
@@ -101,7 +214,7 @@ async def get_sales_analytics(
     }
 
 @router.get("/category-analytics")
-async def get_category_analytics(db: Session = Depends(get_db)):
+def get_category_analytics(db: Session = Depends(get_read_db)):
     """Get analytics by product category"""
     
     # Products by category
@@ -113,15 +226,8 @@ async def get_category_analytics(db: Session = Depends(get_db)):
     .group_by(models.Product.category)\
     .all()
     
-    # Sales by category
-    sales_by_category = db.query(
-        models.Product.category,
-        func.count(models.Order.id).label('sales'),
-        func.sum(models.Order.total_amount).label('revenue')
-    )\
-    .join(models.Order, models.Order.items.contains(models.Product.id))\
-    .group_by(models.Product.category)\
-    .all()
+    # Sales by category, from the order items (one pass, like top products)
+    sales_by_category = db.execute(CATEGORY_SALES_SQL).all()
     
     return {
         "products_by_category": [
@@ -140,4 +246,21 @@ async def get_category_analytics(db: Session = Depends(get_db)):
             }
             for sale in sales_by_category
         ]
-    }
\ No newline at end of file
+    }
+
+@router.get("/customers")
+def get_customer_analytics(db: Session = Depends(get_read_db)):
+    """Get customer RFM segments and monthly repeat-purchase cohorts (precomputed)"""
+    snapshot = customer_analytics.get_snapshot(db)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Customer analytics not computed yet. POST /api/analytics/customers/refresh first."
+        )
+    return snapshot
+
+
+@router.post("/customers/refresh")
+def refresh_customer_analytics(db: Session = Depends(get_db)):
+    """Recompute customer analytics from the full order history"""
+    return customer_analytics.refresh(db)
\ No newline at end of file
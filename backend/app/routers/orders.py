@@ -1,8 +1,12 @@
 # backend/app/routers/orders.py
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from .. import crud, schemas
+from typing import List, Optional
+from .. import crud, schemas, order_events
+from ..config import settings
 from ..database import get_db
 
 router = APIRouter()
@@ -10,8 +14,8 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Order])
 def read_orders(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
     status: str = None,
     db: Session = Depends(get_db)
 ):
@@ -22,6 +26,53 @@ def read_orders(
     return orders
 
 
+@router.get("/events")
+async def stream_order_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, description="Sent by EventSource when it reconnects")
+):
+    """
+    Server-Sent Events feed of order_created and order_status_changed events for
+    the admin panel. Load the list once with GET /api/orders/, then listen here.
+    Events can arrive out of id order, and a reconnect replays some already seen:
+    ignore events whose id has been handled before.
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an event id")
+
+    async def stream():
+        # Subscribe before replaying so nothing committed in between is lost
+        queue = order_events.broker.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            replayed = set()
+            if resume_from is not None:
+                for event in await run_in_threadpool(order_events.events_after, resume_from):
+                    replayed.add(event["id"])
+                    yield order_events.format_event(event)
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    # Events may have been missed: end the stream, the client resumes
+                    break
+                if event["id"] not in replayed:
+                    yield order_events.format_event(event)
+        finally:
+            order_events.broker.unsubscribe(queue)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # nginx: don't buffer the stream
+    })
+
+
 @router.get("/{order_id}", response_model=schemas.Order)
 def read_order(order_id: str, db: Session = Depends(get_db)):
     """
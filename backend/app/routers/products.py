@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from .. import crud, schemas
-from ..database import get_db
+from .. import crud, schemas, recommendations
+from ..suggestions import index as suggestion_index
+from ..config import settings
+from ..database import get_db, get_read_db
+from ..cache import cache
+from ..http_cache import catalog_response
 import requests
 from urllib.parse import urlparse
 import uuid
 
 router = APIRouter()
 
+product_list = TypeAdapter(List[schemas.Product])
+
+
+def products_json(products) -> bytes:
+    return product_list.dump_json(product_list.validate_python(products, from_attributes=True))
+
 
 # IMPORTANT: SPECIFIC ROUTES MUST COME BEFORE GENERIC {product_id} ROUTE
 
@@ -36,57 +47,110 @@ router = APIRouter()
 
 @router.get("/search/", response_model=List[schemas.Product])
 def search_products(
+    request: Request,
     q: str = Query(..., min_length=1, description="Search by product name, description, or sub-category"),
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
     category: Optional[str] = None,
     featured: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    sort: str = Query("newest", pattern="^(newest|price_asc|price_desc|popularity|discount)$"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Search products by name, description, or sub-category
     """
-    print(f"DEBUG - Search called with: q={q}, category={category}, featured={featured}, skip={skip}, limit={limit}")
-    
-    products = crud.get_products(
+    suggestion_index.record_query(q)
+    return catalog_response(request, db, lambda: products_json(crud.get_products(
         db, 
         skip=skip, 
         limit=limit, 
         category=category, 
         featured=featured,
-        search=q
-    )
-    
-    print(f"DEBUG - Found {len(products)} products")
-    return products
+        search=q,
+        sort=sort
+    )))
 
+@router.get("/suggest", response_model=List[schemas.Suggestion])
+def suggest_products(
+    prefix: str = Query(..., min_length=1, max_length=100, description="What has been typed so far"),
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """
+    Search-as-you-type suggestions: products, sub-categories and popular searches,
+    most popular first. Served from memory; use /search/ for full results.
+    """
+    return suggestion_index.suggest(db, prefix, limit=limit)
+
+
+def attribute_filters(
+    material: Optional[List[str]] = Query(None, description="Filter by material, repeat for several"),
+    color: Optional[List[str]] = Query(None, description="Filter by color, repeat for several"),
+    work: Optional[List[str]] = Query(None, description="Filter by work, repeat for several"),
+    occasion: Optional[List[str]] = Query(None, description="Filter by occasion, repeat for several")
+):
+    return {"material": material, "color": color, "work": work, "occasion": occasion}
 
 
 @router.get("/", response_model=List[schemas.Product])
 def read_products(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
     category: Optional[str] = Query(None, description="Filter by category (saree, ornament, bridal-collections)"),
     featured: Optional[bool] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    attributes: dict = Depends(attribute_filters),
+    sort: str = Query("newest", pattern="^(newest|price_asc|price_desc|popularity|discount)$"),
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get products with optional filtering
+    Get products with optional filtering, sorted newest first unless sort is given.
+    Supports If-None-Match and gzip/br; unchanged catalogs get a 304 without a query.
     """
-    products = crud.get_products(
+    return catalog_response(request, db, lambda: products_json(crud.get_products(
         db, 
         skip=skip, 
         limit=limit, 
         category=category, 
         featured=featured,
-        search=search
-    )
-    return products
+        search=search,
+        attributes=attributes,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort
+    )))
+
+
+@router.get("/facets", response_model=schemas.ProductFacets)
+def read_product_facets(
+    request: Request,
+    category: Optional[str] = Query(None, description="Filter by category (saree, ornament, bridal-collections)"),
+    featured: Optional[bool] = None,
+    search: Optional[str] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    attributes: dict = Depends(attribute_filters),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Per-value counts of material, color, work and occasion for the current filters
+    """
+    return catalog_response(request, db, lambda: schemas.ProductFacets(facets=crud.get_product_facets(
+        db,
+        category=category,
+        featured=featured,
+        search=search,
+        attributes=attributes,
+        min_price=min_price,
+        max_price=max_price
+    )).model_dump_json().encode())
 
 
 @router.get("/{product_id}", response_model=schemas.Product)
-def read_product(product_id: str, db: Session = Depends(get_db)):
+def read_product(product_id: str, db: Session = Depends(get_read_db)):
     """
     Get a specific product by its UUID
     """
@@ -98,12 +162,53 @@ def read_product(product_id: str, db: Session = Depends(get_db)):
             detail=f"Invalid product ID format. Must be a valid UUID, got: '{product_id}'"
         )
     
+    # Per-worker cache, evicted on every worker when the product is written. Misses
+    # read a replica: one still behind a write can put the old row back, for at most the TTL.
+    cache_key = str(uuid.UUID(product_id))
+    cached = cache.get("product", cache_key)
+    if cached is not None:
+        return cached
+
+    generation = cache.generation()
     product = crud.get_product(db, product_id=product_id)
     if product is None:
         raise HTTPException(status_code=404, detail="Product not found")
+
+    product = schemas.Product.model_validate(product)
+    cache.set("product", cache_key, product, generation=generation)
     return product
 
 
+@router.get("/{product_id}/related", response_model=List[schemas.Product])
+def read_related_products(
+    product_id: str,
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Products frequently bought together with this one, best match first
+    """
+    try:
+        cache_key = str(uuid.UUID(product_id))
+    except ValueError:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Invalid product ID format. Must be a valid UUID, got: '{product_id}'"
+        )
+    
+    # Lists are precomputed by app.recommendations; cache the top 20 and slice.
+    # Misses read a replica, like read_product.
+    related = cache.get("related", cache_key)
+    if related is None:
+        generation = cache.generation()
+        related = [
+            schemas.Product.model_validate(product)
+            for product in recommendations.get_related_products(db, product_id=cache_key, limit=20)
+        ]
+        cache.set("related", cache_key, related, generation=generation)
+    return related[:limit]
+
+
 @router.post("/", response_model=schemas.Product)
 def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)):
     """
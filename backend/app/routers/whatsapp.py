@@ -1,7 +1,12 @@
 # backend/app/routers/whatsapp.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
 from twilio.rest import Client
 from twilio.twiml.messaging_response import MessagingResponse
+import re
+from .. import crud
+from ..order_ids import order_reference
+from ..database import get_db
 
 router = APIRouter()
 
@@ -12,22 +17,54 @@ TWILIO_WHATSAPP_NUMBER = "whatsapp:+14155238886"  # Twilio WhatsApp number
 
 client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
 
+# Intents checked in priority order, compiled once at import
+INTENT_PATTERNS = [
+    ("order_status", re.compile(r"order|track", re.IGNORECASE)),
+    ("pricing", re.compile(r"price|cost", re.IGNORECASE)),
+    ("contact", re.compile(r"contact|help", re.IGNORECASE)),
+]
+
+
+def match_intent(message: str):
+    for intent, pattern in INTENT_PATTERNS:
+        if pattern.search(message):
+            return intent
+    return None
+
+
+def order_status_reply(orders) -> str:
+    if not orders:
+        return "We couldn't find any orders for this number. To check your order status, please visit our website: https://mbridal.online/orders"
+
+    lines = ["Your recent orders:"]
+    for order in orders:
+        lines.append(
+            f"#{order_reference(order.id)} - {(order.status or 'pending').capitalize()} - "
+            f"₹{order.total_amount:,.0f} ({order.created_at:%d %b %Y})"
+        )
+    lines.append("Need help? Call +91 88488 36951")
+    return "\n".join(lines)
+
+
+# Plain def: the DB query and Twilio call block, so run in the threadpool
 @router.post("/whatsapp/webhook")
-async def whatsapp_webhook(request: dict):
+def whatsapp_webhook(request: dict, db: Session = Depends(get_db)):
     """
     Webhook to receive WhatsApp messages from customers
     """
     try:
         # Parse incoming message
-        incoming_msg = request.get('Body', '').lower()
+        incoming_msg = request.get('Body', '')
         from_number = request.get('From', '')
         
         # Handle different message types
-        if 'order' in incoming_msg or 'track' in incoming_msg:
-            response = "To check your order status, please visit our website: https://mbridal.online/orders"
-        elif 'price' in incoming_msg or 'cost' in incoming_msg:
+        intent = match_intent(incoming_msg)
+        if intent == "order_status":
+            # One indexed query on the normalized sender number
+            response = order_status_reply(crud.get_orders_by_phone(db, from_number))
+        elif intent == "pricing":
             response = "You can view all our products with prices at: https://mbridal.online/products"
-        elif 'contact' in incoming_msg or 'help' in incoming_msg:
+        elif intent == "contact":
             response = "📞 Call us: +91 88488 36951\n📍 Visit: First floor, Bengacheri Complex, Opposit Vyapar Bhavan, Kanhangad\n🌐 Website: https://mbridal.online"
         else:
             response = "Thanks for contacting Manthrakodi Bridals! How can I help you today? You can:\n1. Place an order on our website\n2. Check order status\n3. View products\n4. Contact support"
@@ -45,7 +82,7 @@ async def whatsapp_webhook(request: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/whatsapp/send-order")
-async def send_order_to_whatsapp(order_data: dict):
+def send_order_to_whatsapp(order_data: dict):
     """
     Send order confirmation to WhatsApp
     """
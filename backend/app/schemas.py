@@ -56,6 +56,21 @@ class Product(ProductBase):
         from_attributes = True
 
 
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+
+class ProductFacets(BaseModel):
+    facets: Dict[str, List[FacetValue]]
+
+
+class Suggestion(BaseModel):
+    text: str
+    type: str  # product, sub_category or query
+    product_id: Optional[UUID] = None
+
+
 # Order Item Schemas
 class OrderItem(BaseModel):
     product_id: UUID
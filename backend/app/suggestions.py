@@ -0,0 +1,32 @@
+# backend/app/suggestions.py
+"""
+Search-as-you-type suggestions from an in-memory sorted-array prefix index.
+
+Product names, sub-categories and queries searched often on this worker are
+indexed under every word suffix ("silk saree", "saree" for "Silk Saree"), so a
+prefix lookup is two bisects over a sorted list (app.prefix_index). Product
+writes arrive through the cache invalidation bus and are applied incrementally
+before the next lookup. Every REBUILD_SECONDS, and after the listener
+reconnects, a new index is built on a background thread (picking up popularity
+and new popular queries) and swapped in; lookups keep using the old one
+meanwhile. Results per prefix are memoized until the index changes.
+"""
+from typing import Iterable, Optional
+from sqlalchemy.orm import Session
+from . import models
+from .cache import cache
+from .database import SessionLocal
+from .prefix_index import SuggestionIndex
+
+
+def load_products(db: Session, product_ids: Optional[Iterable[str]] = None) -> list:
+    query = db.query(
+        models.Product.id, models.Product.name, models.Product.sub_category, models.Product.popularity
+    )
+    if product_ids is not None:
+        query = query.filter(models.Product.id.in_(product_ids))
+    return query.all()
+
+
+index = SuggestionIndex(SessionLocal, load_products)
+cache.subscribe("product", index.product_changed)
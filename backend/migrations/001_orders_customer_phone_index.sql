@@ -0,0 +1,7 @@
+-- backend/migrations/001_orders_customer_phone_index.sql
+-- WhatsApp order-status lookups by normalized customer phone.
+-- New databases get this from models.Base.metadata.create_all; run this on
+-- existing ones:  psql "$DATABASE_URL" -f migrations/001_orders_customer_phone_index.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_customer_phone_norm
+    ON orders (right(regexp_replace(customer_phone, '[^0-9]', '', 'g'), 10), created_at DESC);
@@ -0,0 +1,23 @@
+-- backend/migrations/002_hot_query_indexes.sql
+-- Indexes for get_products, get_orders and the analytics dashboard.
+-- New databases get these from models.Base.metadata.create_all; run this on
+-- existing ones:  psql "$DATABASE_URL" -f migrations/002_hot_query_indexes.sql
+-- Verify afterwards with:  python -m perf.check_query_plans
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_category_featured
+    ON products (category, featured);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_featured
+    ON products (category) WHERE featured = true;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_low_stock
+    ON products (stock) WHERE stock < 10;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_created_at
+    ON orders (created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_status_created_at
+    ON orders (status, created_at DESC);
+
+ANALYZE products;
+ANALYZE orders;
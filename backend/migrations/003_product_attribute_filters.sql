@@ -0,0 +1,12 @@
+-- backend/migrations/003_product_attribute_filters.sql
+-- Attribute filters/facets and price ranges on the product listing.
+-- New databases get these from models.Base.metadata.create_all; run this on
+-- existing ones:  psql "$DATABASE_URL" -f migrations/003_product_attribute_filters.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_attributes
+    ON products USING gin (attributes jsonb_path_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_category_price
+    ON products (category, price);
+
+ANALYZE products;
@@ -0,0 +1,35 @@
+-- backend/migrations/004_product_sort_orders.sql
+-- Precomputed sort columns and indexes for the product listing sort orders.
+-- New databases get these from models.Base.metadata.create_all; run this on
+-- existing ones:  psql "$DATABASE_URL" -f migrations/004_product_sort_orders.sql
+
+ALTER TABLE products ADD COLUMN IF NOT EXISTS popularity integer NOT NULL DEFAULT 0;
+
+ALTER TABLE products ADD COLUMN IF NOT EXISTS discount_percent double precision
+    GENERATED ALWAYS AS (
+        CASE WHEN original_price > price THEN (original_price - price) * 100 / original_price ELSE 0 END
+    ) STORED;
+
+-- Backfill units ordered from order history; app.popularity keeps it current from here on
+UPDATE products p
+SET popularity = s.units
+FROM (
+    SELECT (item->>'product_id')::uuid AS product_id, sum((item->>'quantity')::int) AS units
+    FROM orders, jsonb_array_elements(items) AS item
+    GROUP BY 1
+) s
+WHERE p.id = s.product_id;
+
+-- ix_products_category_price gains id as a tie-breaker
+DROP INDEX CONCURRENTLY IF EXISTS ix_products_category_price;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_category_price ON products (category, price, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_category_created_at ON products (category, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_created_at ON products (created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_price ON products (price, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_category_popularity ON products (category, popularity, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_popularity ON products (popularity, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_category_discount ON products (category, discount_percent, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_discount ON products (discount_percent, id);
+
+ANALYZE products;
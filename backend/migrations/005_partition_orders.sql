@@ -0,0 +1,51 @@
+-- backend/migrations/005_partition_orders.sql
+-- Move orders to monthly range partitions on created_at (see app.partitions).
+-- New databases get these from models.Base.metadata.create_all; run this on
+-- existing ones, in a maintenance window (it copies every order and holds an
+-- exclusive lock on orders until it commits):
+--   psql "$DATABASE_URL" -f migrations/005_partition_orders.sql
+-- Afterwards schedule:  python -m app.partitions ensure  (and archive)
+
+BEGIN;
+
+-- The partition key is part of the primary key, so it can't be NULL
+UPDATE orders SET created_at = coalesce(updated_at, now()) WHERE created_at IS NULL;
+
+ALTER TABLE orders RENAME TO orders_unpartitioned;
+ALTER INDEX orders_pkey RENAME TO orders_unpartitioned_pkey;
+ALTER INDEX IF EXISTS ix_orders_created_at RENAME TO ix_orders_unpartitioned_created_at;
+ALTER INDEX IF EXISTS ix_orders_status_created_at RENAME TO ix_orders_unpartitioned_status_created_at;
+ALTER INDEX IF EXISTS ix_orders_customer_phone_norm RENAME TO ix_orders_unpartitioned_customer_phone_norm;
+
+CREATE TABLE orders (
+    LIKE orders_unpartitioned INCLUDING DEFAULTS,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- One partition per month from the oldest order to three months ahead
+DO $$
+DECLARE
+    bound date := date_trunc('month', coalesce((SELECT min(created_at) FROM orders_unpartitioned), now()));
+BEGIN
+    WHILE bound <= date_trunc('month', now()) + interval '3 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF orders FOR VALUES FROM (%L) TO (%L)',
+            'orders_' || to_char(bound, 'YYYY_MM'), bound, bound + interval '1 month'
+        );
+        bound := bound + interval '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO orders SELECT * FROM orders_unpartitioned;
+
+CREATE INDEX ix_orders_created_at ON orders (created_at DESC);
+CREATE INDEX ix_orders_status_created_at ON orders (status, created_at DESC);
+CREATE INDEX ix_orders_customer_phone_norm
+    ON orders (right(regexp_replace(customer_phone, '[^0-9]', '', 'g'), 10), created_at DESC);
+
+COMMIT;
+
+ANALYZE orders;
+
+-- Once the application is verified against the partitioned table:
+-- DROP TABLE orders_unpartitioned;
@@ -0,0 +1,30 @@
+-- backend/migrations/006_drop_orders_default_partition.sql
+-- Drop the orders default partition an earlier 005 created: with it PostgreSQL
+-- can't read partitions in created_at order, so get_orders sorts every one.
+-- Its rows move to monthly partitions. Takes an exclusive lock on orders; a
+-- no-op where there is no default partition. On existing databases:
+--   psql "$DATABASE_URL" -f migrations/006_drop_orders_default_partition.sql
+-- Afterwards 'python -m app.partitions ensure' must run at least monthly.
+
+BEGIN;
+
+DO $$
+DECLARE
+    bound date;
+BEGIN
+    IF to_regclass('orders_default') IS NULL THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE orders DETACH PARTITION orders_default;
+    FOR bound IN SELECT DISTINCT date_trunc('month', created_at)::date FROM orders_default LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF orders FOR VALUES FROM (%L) TO (%L)',
+            'orders_' || to_char(bound, 'YYYY_MM'), bound, bound + interval '1 month'
+        );
+    END LOOP;
+    INSERT INTO orders SELECT * FROM orders_default;
+    DROP TABLE orders_default;
+END $$;
+
+COMMIT;
@@ -0,0 +1,135 @@
+# backend/perf/check_query_plans.py
+"""
+Query-plan regression check for the hot queries.
+
+Runs the real crud/analytics code, captures the SQL it sends, EXPLAINs each
+statement and fails if products/orders are read with a sequential scan.
+
+Point POSTGRES_* at a scratch database, then from backend/:
+
+    python -m perf.check_query_plans --seed   # first run: create tables + seed
+    python -m perf.check_query_plans
+"""
+import argparse
+import asyncio
+import json
+import sys
+from sqlalchemy import event, text
+
+from app import crud, models
+from app.database import engine, SessionLocal
+from app.routers import analytics
+from .seed import seed
+
+
+HOT_TABLES = {"products", "orders"}
+
+# Plans name partitions (orders_2024_05), not the partitioned table
+PARENT_TABLES_SQL = text("""
+    SELECT child.relname, parent.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+""")
+
+# (name, call, only check statements containing this text)
+CASES = [
+    ("products by category + featured", lambda db: crud.get_products(db, category="saree", featured=True), None),
+    ("featured products", lambda db: crud.get_products(db, featured=True), None),
+    ("products by category, price ascending", lambda db: crud.get_products(db, category="saree", sort="price_asc"), None),
+    ("products by popularity", lambda db: crud.get_products(db, sort="popularity"), None),
+    ("products by discount", lambda db: crud.get_products(db, category="ornament", sort="discount"), None),
+    ("orders newest first", lambda db: crud.get_orders(db), None),
+    ("orders by status", lambda db: crud.get_orders(db, status="pending"), None),
+    ("order by id", lambda db: crud.get_order(db, str(crud.new_order_id())), None),
+    ("dashboard today's orders", lambda db: asyncio.run(analytics.get_dashboard_stats(db=db)), "created_at >="),
+    ("dashboard low stock", lambda db: asyncio.run(analytics.get_dashboard_stats(db=db)), "stock <"),
+    ("sales analytics series", lambda db: analytics.get_sales_analytics(period="month", db=db), "date_trunc"),
+]
+
+
+def capture_statements(db, call):
+    """Run call(db) and return the (statement, parameters) pairs it executed"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        try:
+            call(db)
+        except Exception:
+            # Only the SQL matters here; result handling errors are not plan regressions
+            db.rollback()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def seq_scanned_tables(plan, parents: dict) -> set:
+    tables = set()
+    if plan.get("Node Type") == "Seq Scan":
+        relation = plan.get("Relation Name")
+        if parents.get(relation, relation) in HOT_TABLES:
+            tables.add(relation)
+    for child in plan.get("Plans", []):
+        tables |= seq_scanned_tables(child, parents)
+    return tables
+
+
+def explain(db, statement, parameters):
+    result = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return plan[0]["Plan"]
+
+
+def check() -> int:
+    failures = 0
+    db = SessionLocal()
+    try:
+        parents = dict(db.execute(PARENT_TABLES_SQL).all())
+        for name, call, only in CASES:
+            statements = [
+                (statement, parameters)
+                for statement, parameters in capture_statements(db, call)
+                if only is None or only in statement
+            ]
+            if not statements:
+                print(f"❌ {name}: no matching statement was executed")
+                failures += 1
+                continue
+
+            for statement, parameters in statements:
+                tables = seq_scanned_tables(explain(db, statement, parameters), parents)
+                if tables:
+                    print(f"❌ {name}: sequential scan on {', '.join(sorted(tables))}")
+                    print(f"   {statement}")
+                    failures += 1
+                else:
+                    print(f"✅ {name}")
+    finally:
+        db.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assert hot queries use index scans")
+    parser.add_argument("--seed", action="store_true", help="create tables and seed an empty database first")
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--orders", type=int, default=200000)
+    args = parser.parse_args()
+
+    if args.seed:
+        models.Base.metadata.create_all(bind=engine)
+        seed(engine, products=args.products, orders=args.orders)
+        print(f"✅ Seeded {args.products} products and {args.orders} orders")
+
+    failures = check()
+    if failures:
+        print(f"{failures} query plan regression(s)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# backend/perf/datagen.py
+"""
+Synthetic catalog + order history for load tests.
+
+Writes realistic products (names, sub-categories, attributes, prices) and
+orders with JSONB items straight into PostgreSQL with COPY. Point POSTGRES_*
+at a scratch database, then from backend/:
+
+    python -m perf.datagen --products 100000 --orders 1000000
+"""
+import argparse
+import io
+import itertools
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from app import models
+from app.database import engine
+from app.partitions import ensure_partitions
+from .seed import table_count
+
+
+CATALOG = {
+    "saree": {
+        "sub_categories": ["Kanjeevaram", "Kasavu", "Banarasi", "Tissue", "Organza", "Chiffon"],
+        "materials": ["Pure Silk", "Art Silk", "Cotton", "Tissue", "Organza"],
+        "works": ["Zari", "Embroidery", "Hand Painted", "Temple Border", "Mirror Work"],
+        "price_range": (1500, 60000),
+    },
+    "ornament": {
+        "sub_categories": ["Necklace", "Earring", "Bangle", "Jhumka", "Maang Tikka", "Waist Belt"],
+        "materials": ["Gold Plated", "Kundan", "Temple", "Antique", "Polki"],
+        "works": ["Stone Work", "Enamel", "Filigree", "Pearl Drop", "Plain"],
+        "price_range": (300, 15000),
+    },
+    "bridal-collections": {
+        "sub_categories": ["Wedding Set", "Reception Set", "Engagement Set", "Haldi Set"],
+        "materials": ["Pure Silk", "Kundan", "Gold Plated", "Temple"],
+        "works": ["Zari", "Stone Work", "Embroidery", "Temple Border"],
+        "price_range": (8000, 150000),
+    },
+}
+COLORS = ["Red", "Maroon", "Gold", "Cream", "Green", "Magenta", "Peach", "Royal Blue", "Mustard", "Pink"]
+OCCASIONS = ["Wedding", "Engagement", "Reception", "Festival", "Party", "Daily Wear"]
+ADJECTIVES = ["Classic", "Royal", "Elegant", "Traditional", "Designer", "Heritage", "Grand", "Festive"]
+FIRST_NAMES = ["Anjali", "Lakshmi", "Divya", "Arya", "Meera", "Nisha", "Fathima", "Sneha", "Reshma", "Athira"]
+LAST_NAMES = ["Nair", "Menon", "Pillai", "Kurian", "Thomas", "Rahman", "Varma", "Shetty", "Kamath", "Das"]
+CITIES = [("Kanhangad", "671315"), ("Kasaragod", "671121"), ("Kannur", "670001"), ("Kozhikode", "673001"),
+          ("Mangalore", "575001"), ("Kochi", "682001"), ("Thrissur", "680001")]
+STATUSES = ["pending", "confirmed", "processing", "shipped", "delivered", "cancelled"]
+STATUS_WEIGHTS = [5, 5, 5, 10, 70, 5]
+
+PRODUCT_COLUMNS = ["id", "name", "description", "price", "original_price", "category", "sub_category",
+                   "images", "stock", "featured", "attributes", "created_at", "updated_at"]
+ORDER_COLUMNS = ["id", "customer_name", "customer_phone", "customer_email", "customer_address",
+                 "customer_city", "customer_pincode", "items", "total_amount", "status", "message",
+                 "created_at", "updated_at"]
+
+# Same backfill as migrations/004, so the popularity sort has data to work with
+BACKFILL_POPULARITY_SQL = """
+UPDATE products p
+SET popularity = s.units
+FROM (
+    SELECT (item->>'product_id')::uuid AS product_id, sum((item->>'quantity')::int) AS units
+    FROM orders, jsonb_array_elements(items) AS item
+    GROUP BY 1
+) s
+WHERE p.id = s.product_id
+"""
+
+
+def generate_products(rng: random.Random, count: int, now: datetime):
+    for n in range(count):
+        category = rng.choices(list(CATALOG), weights=[5, 4, 1])[0]
+        spec = CATALOG[category]
+        sub_category = rng.choice(spec["sub_categories"])
+        material = rng.choice(spec["materials"])
+        color = rng.choice(COLORS)
+        work = rng.choice(spec["works"])
+        price = round(rng.uniform(*spec["price_range"]), -1)
+        created_at = now - timedelta(days=rng.uniform(0, 1095))
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"{rng.choice(ADJECTIVES)} {color} {material} {sub_category}",
+            "description": f"{work} {sub_category.lower()} in {color.lower()} {material.lower()}, ideal for {rng.choice(OCCASIONS).lower()}.",
+            "price": price,
+            "original_price": round(price * rng.uniform(1.1, 1.6), -1) if rng.random() < 0.4 else None,
+            "category": category,
+            "sub_category": sub_category,
+            "images": [f"https://i.ibb.co/catalog/{n}-{i}.jpg" for i in range(rng.randint(1, 4))],
+            "stock": rng.randint(0, 9) if rng.random() < 0.05 else rng.randint(10, 200),
+            "featured": rng.random() < 0.05,
+            "attributes": {"material": material, "color": color, "work": work,
+                           "occasion": rng.choice(OCCASIONS)},
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def generate_orders(rng: random.Random, count: int, products: list, now: datetime, customers: int):
+    # Popularity is skewed: a few products sell far more than the long tail
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(products))))
+    for _ in range(count):
+        customer = rng.randrange(customers)
+        city, pincode = CITIES[customer % len(CITIES)]
+        picked = rng.choices(products, cum_weights=cum_weights, k=rng.choices([1, 2, 3, 4], weights=[60, 25, 10, 5])[0])
+        items = [
+            {"product_id": product["id"], "product_name": product["name"],
+             "quantity": rng.choices([1, 2], weights=[90, 10])[0], "price": product["price"]}
+            for product in picked
+        ]
+        created_at = now - timedelta(days=rng.uniform(0, 730))
+        first, last = FIRST_NAMES[customer % 10], LAST_NAMES[customer // 10 % 10]
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "customer_name": f"{first} {last}",
+            "customer_phone": f"9{customer:09d}",
+            "customer_email": f"{first.lower()}.{customer}@example.com" if customer % 3 else None,
+            "customer_address": f"House {customer % 500}, Ward {customer % 40}",
+            "customer_city": city,
+            "customer_pincode": pincode,
+            "items": items,
+            "total_amount": sum(item["price"] * item["quantity"] for item in items),
+            "status": rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0],
+            "message": None,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def copy_value(value):
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, list):
+        if value and isinstance(value[0], dict):
+            return json.dumps(value)
+        return "{" + ",".join(f'"{item}"' for item in value) + "}"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+def copy_rows(raw_conn, table: str, columns: list, rows, batch_size: int = 20000):
+    """Stream rows into table with COPY in batches, keeping memory flat"""
+    cursor = raw_conn.cursor()
+    total = 0
+    while True:
+        # Generated values never contain tabs, newlines or backslashes
+        buffer = io.StringIO()
+        batch = 0
+        for row in rows:
+            buffer.write("\t".join(copy_value(row[column]) for column in columns) + "\n")
+            batch += 1
+            if batch == batch_size:
+                break
+        if not batch:
+            break
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+        total += batch
+        print(f"   {table}: {total} rows")
+    return total
+
+
+def generate(products: int = 100000, orders: int = 1000000, customers: int = 200000, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    models.Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        if table_count(conn, "products") or table_count(conn, "orders"):
+            raise RuntimeError("Refusing to generate: products/orders already contain rows. Use a scratch database.")
+    # Orders span the last two years
+    ensure_partitions(engine, months_back=25)
+
+    raw_conn = engine.raw_connection()
+    try:
+        catalog = []
+
+        def keep(rows):
+            for row in rows:
+                catalog.append({"id": row["id"], "name": row["name"], "price": row["price"]})
+                yield row
+
+        copy_rows(raw_conn, "products", PRODUCT_COLUMNS, keep(generate_products(rng, products, now)))
+        rng.shuffle(catalog)
+        copy_rows(raw_conn, "orders", ORDER_COLUMNS, generate_orders(rng, orders, catalog, now, customers))
+        raw_conn.commit()
+
+        cursor = raw_conn.cursor()
+        cursor.execute(BACKFILL_POPULARITY_SQL)
+        cursor.execute("ANALYZE products")
+        cursor.execute("ANALYZE orders")
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalog and order history")
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed, for reproducible datasets")
+    args = parser.parse_args()
+
+    generate(products=args.products, orders=args.orders, customers=args.customers, seed=args.seed)
+    print(f"✅ Generated {args.products} products and {args.orders} orders")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# backend/perf/loadtest.py
+"""
+HTTP load test for the storefront and admin endpoints.
+
+Start the API against a database filled by perf.datagen, then from backend/:
+
+    python -m perf.loadtest --base-url http://localhost:8000 --duration 30 --concurrency 16
+    python -m perf.loadtest --scenario browse --scenario search --output run1.json
+
+Reports p50/p95/p99 latency and throughput per scenario. Use --output to keep
+a JSON report and --compare to diff against a previous run.
+
+All load comes from one client address, so raise the per-client rate limit
+(e.g. RATE_LIMIT_PER_SECOND=100000) unless 429s are what you are testing.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+SEARCH_TERMS = ["silk", "kasavu", "necklace", "earring", "red saree", "kundan", "bridal set", "jhumka", "gold"]
+CATEGORIES = ["saree", "ornament", "bridal-collections"]
+
+
+def browse(http, base_url, rng, product_ids):
+    params = {"skip": rng.choice([0, 0, 0, 20, 40]), "limit": 20}
+    if rng.random() < 0.8:
+        params["category"] = rng.choice(CATEGORIES)
+    if rng.random() < 0.2:
+        params["featured"] = "true"
+    return [http.get(f"{base_url}/api/products/", params=params)]
+
+
+def search(http, base_url, rng, product_ids):
+    return [http.get(f"{base_url}/api/products/search/", params={"q": rng.choice(SEARCH_TERMS), "limit": 20})]
+
+
+def detail(http, base_url, rng, product_ids):
+    return [http.get(f"{base_url}/api/products/{rng.choice(product_ids)}")]
+
+
+def cart_hydration(http, base_url, rng, product_ids):
+    # The cart page re-fetches every product in the cart
+    return [http.get(f"{base_url}/api/products/{product_id}")
+            for product_id in rng.sample(product_ids, min(len(product_ids), rng.randint(1, 5)))]
+
+
+def place_order(http, base_url, rng, product_ids):
+    items = [
+        {"product_id": product_id, "product_name": "Load test item", "quantity": 1, "price": 1000}
+        for product_id in rng.sample(product_ids, min(len(product_ids), rng.randint(1, 3)))
+    ]
+    order = {
+        "customer_name": "Load Test",
+        "customer_phone": f"9{rng.randrange(10 ** 9):09d}",
+        "customer_address": "Load test address",
+        "customer_city": "Kanhangad",
+        "customer_pincode": "671315",
+        "items": items,
+        "total_amount": 1000 * len(items),
+    }
+    return [http.post(f"{base_url}/api/orders/", json=order)]
+
+
+def analytics(http, base_url, rng, product_ids):
+    if rng.random() < 0.5:
+        return [http.get(f"{base_url}/api/analytics/dashboard-stats")]
+    return [http.get(f"{base_url}/api/analytics/sales-analytics",
+                     params={"period": rng.choice(["day", "week", "month", "year"])})]
+
+
+SCENARIOS = {
+    "browse": browse,
+    "search": search,
+    "detail": detail,
+    "cart": cart_hydration,
+    "order": place_order,
+    "analytics": analytics,
+}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies_ms, errors, elapsed):
+    latencies_ms = sorted(latencies_ms)
+    return {
+        "requests": len(latencies_ms),
+        "errors": errors,
+        "throughput": round(len(latencies_ms) / elapsed, 1) if elapsed else 0.0,
+        "p50": round(percentile(latencies_ms, 50), 2),
+        "p95": round(percentile(latencies_ms, 95), 2),
+        "p99": round(percentile(latencies_ms, 99), 2),
+    }
+
+
+def print_report(report, baseline=None):
+    print(f"{'scenario':<14}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in report.items():
+        print(f"{name:<14}{stats['requests']:>10}{stats['errors']:>8}{stats['throughput']:>10}"
+              f"{stats['p50']:>10}{stats['p95']:>10}{stats['p99']:>10}")
+        if baseline and name in baseline:
+            before = baseline[name]
+            deltas = [
+                f"{key} {(stats[key] - before[key]) / before[key] * 100:+.1f}%"
+                for key in ("throughput", "p50", "p95", "p99") if before[key]
+            ]
+            print(f"{'':<14}vs baseline: {', '.join(deltas)}")
+
+
+def run_scenario(scenario, base_url, product_ids, duration, concurrency, seed):
+    latencies_ms = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(worker_id):
+        nonlocal errors
+        rng = random.Random(seed + worker_id)
+        http = requests.Session()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                failed = any(response.status_code >= 400 for response in scenario(http, base_url, rng, product_ids))
+            except requests.RequestException:
+                failed = True
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with lock:
+                if failed:
+                    errors += 1
+                else:
+                    latencies_ms.append(elapsed_ms)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return summarize(latencies_ms, errors, time.perf_counter() - started)
+
+
+def fetch_product_ids(base_url):
+    product_ids = []
+    for category in CATEGORIES:
+        response = requests.get(f"{base_url}/api/products/", params={"category": category, "limit": 100})
+        response.raise_for_status()
+        product_ids.extend(product["id"] for product in response.json())
+    if not product_ids:
+        raise RuntimeError("No products found. Fill the database with python -m perf.datagen first.")
+    return product_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Manthrakodi Bridal API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenario to run, repeatable (default: all)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="JSON report of a previous run to compare against")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    product_ids = fetch_product_ids(base_url)
+
+    report = {}
+    for name in args.scenario or list(SCENARIOS):
+        print(f"🚀 {name}: {args.concurrency} clients for {args.duration}s")
+        report[name] = run_scenario(SCENARIOS[name], base_url, product_ids, args.duration, args.concurrency, args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
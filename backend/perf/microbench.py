@@ -0,0 +1,93 @@
+# backend/perf/microbench.py
+"""
+In-process micro-benchmarks for crud.py, without HTTP or JSON overhead.
+
+Against a database filled by perf.datagen, from backend/:
+
+    python -m perf.microbench --iterations 200 --output crud-before.json
+    python -m perf.microbench --iterations 200 --compare crud-before.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from app import crud, models
+from app.database import SessionLocal
+from app.routers import analytics
+from .loadtest import SEARCH_TERMS, CATEGORIES, print_report, summarize
+
+
+def benchmarks(product_ids):
+    return {
+        "get_products": lambda db, rng: crud.get_products(db, category=rng.choice(CATEGORIES), limit=20),
+        "featured": lambda db, rng: crud.get_products(db, featured=True, limit=20),
+        "search": lambda db, rng: crud.get_products(db, search=rng.choice(SEARCH_TERMS), limit=20),
+        "get_product": lambda db, rng: crud.get_product(db, rng.choice(product_ids)),
+        "get_orders": lambda db, rng: crud.get_orders(db, limit=100),
+        "orders_status": lambda db, rng: crud.get_orders(db, status="pending", limit=100),
+        "dashboard": lambda db, rng: asyncio.run(analytics.get_dashboard_stats(db=db)),
+    }
+
+
+def run(name, call, iterations, seed):
+    rng = random.Random(seed)
+    latencies_ms = []
+    errors = 0
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        for _ in range(iterations):
+            call_started = time.perf_counter()
+            try:
+                call(db, rng)
+            except Exception as e:
+                errors += 1
+                db.rollback()
+                print(f"⚠️  {name}: {e}")
+                continue
+            latencies_ms.append((time.perf_counter() - call_started) * 1000)
+            # Don't let the identity map turn repeat lookups into cache hits
+            db.expunge_all()
+    finally:
+        db.close()
+    return summarize(latencies_ms, errors, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark crud.py against the local database")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--only", action="append", help="benchmark to run, repeatable (default: all)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="JSON report of a previous run to compare against")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        product_ids = [str(row.id) for row in db.query(models.Product.id).limit(1000)]
+    finally:
+        db.close()
+    if not product_ids:
+        raise RuntimeError("No products found. Fill the database with python -m perf.datagen first.")
+
+    report = {}
+    for name, call in benchmarks(product_ids).items():
+        if args.only and name not in args.only:
+            continue
+        report[name] = run(name, call, args.iterations, args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# backend/tests/test_admission.py
+from starlette.requests import Request
+from app import admission
+from app.admission import TokenBuckets, client_key
+
+
+def make_request(forwarded_for: str = None, peer: str = "10.0.0.9") -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (peer, 51234)})
+
+
+def test_burst_then_wait_for_refill(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    buckets = TokenBuckets(rate=2, burst=3)
+
+    assert [buckets.take("a") for _ in range(3)] == [0, 0, 0]
+    assert buckets.take("a") == 0.5
+    # Other clients have their own bucket
+    assert buckets.take("b") == 0
+
+    now[0] += 0.5
+    assert buckets.take("a") == 0
+    assert buckets.take("a") > 0
+
+
+def test_idle_clients_are_forgotten(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    buckets = TokenBuckets(rate=1, burst=2, max_clients=2)
+
+    buckets.take("a")
+    buckets.take("b")
+    now[0] += 5
+    buckets.take("c")
+    buckets.take("d")
+
+    assert set(buckets._buckets) == {"c", "d"}
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(admission.settings, "TRUSTED_PROXY_HOPS", 0)
+    assert client_key(make_request("1.2.3.4")) == "10.0.0.9"
+
+
+def test_client_is_taken_hops_from_the_right(monkeypatch):
+    monkeypatch.setattr(admission.settings, "TRUSTED_PROXY_HOPS", 1)
+    # The client prepended a spoofed address; the load balancer appended the real one
+    assert client_key(make_request("6.6.6.6, 1.2.3.4")) == "1.2.3.4"
+
+    monkeypatch.setattr(admission.settings, "TRUSTED_PROXY_HOPS", 2)
+    assert client_key(make_request("6.6.6.6, 1.2.3.4, 10.0.0.2")) == "1.2.3.4"
+    # Fewer entries than hops: the leftmost one
+    assert client_key(make_request("1.2.3.4")) == "1.2.3.4"
+
+
+def test_missing_or_empty_header_uses_the_peer(monkeypatch):
+    monkeypatch.setattr(admission.settings, "TRUSTED_PROXY_HOPS", 1)
+    assert client_key(make_request()) == "10.0.0.9"
+    assert client_key(make_request(" , ")) == "10.0.0.9"
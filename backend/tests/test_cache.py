@@ -0,0 +1,50 @@
+# backend/tests/test_cache.py
+from app.cache import LocalCache
+
+
+def test_set_after_racing_invalidation_is_dropped():
+    cache = LocalCache()
+    generation = cache.generation()
+    # Another request invalidates while this one is still loading
+    cache.invalidate("product", "p1")
+    cache.set("product", "p1", "stale", generation=generation)
+
+    assert cache.get("product", "p1") is None
+
+
+def test_namespace_invalidation_and_clear_also_win():
+    cache = LocalCache()
+    generation = cache.generation()
+    cache.invalidate("product")
+    cache.set("product", "p1", "stale", generation=generation)
+    assert cache.get("product", "p1") is None
+
+    generation = cache.generation()
+    cache.clear()
+    cache.set("catalog", "list", "stale", generation=generation)
+    assert cache.get("catalog", "list") is None
+
+
+def test_unrelated_invalidation_does_not_block_the_fill():
+    cache = LocalCache()
+    generation = cache.generation()
+    cache.invalidate("product", "p2")
+    cache.invalidate("orders")
+    cache.set("product", "p1", "fresh", generation=generation)
+
+    assert cache.get("product", "p1") == "fresh"
+
+
+def test_fill_taken_after_invalidation_is_kept():
+    cache = LocalCache()
+    cache.invalidate("product", "p1")
+    cache.set("product", "p1", "fresh", generation=cache.generation())
+
+    assert cache.get("product", "p1") == "fresh"
+
+
+def test_expired_entries_are_not_returned():
+    cache = LocalCache()
+    cache.set("product", "p1", "value", ttl=-1)
+
+    assert cache.get("product", "p1") is None
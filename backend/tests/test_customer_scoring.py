@@ -0,0 +1,58 @@
+# backend/tests/test_customer_scoring.py
+import time
+import numpy as np
+from app.customer_scoring import quintile_scores, rfm
+
+
+def test_tied_values_get_the_same_score():
+    # Ties score at their midpoint rank, not the lowest rank they span
+    scores = quintile_scores(np.array([1, 1, 1, 1, 1, 1, 1, 2, 2, 5]))
+    assert scores.tolist() == [2, 2, 2, 2, 2, 2, 2, 4, 4, 5]
+
+
+def test_all_tied_values_score_in_the_middle():
+    assert quintile_scores(np.full(10, 7.0)).tolist() == [3] * 10
+
+
+def test_distinct_values_fill_every_quintile():
+    scores = quintile_scores(np.arange(10.0))
+    assert scores.tolist() == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+
+
+def test_identical_customers_share_a_segment():
+    # Ten customers, one order each of the same amount, all three days ago
+    now = time.time()
+    customer = np.arange(10)
+    timestamps = np.full(10, now - 3 * 86400)
+    amounts = np.full(10, 2500.0)
+
+    result = rfm(customer, timestamps, amounts, 10, now)
+
+    populated = [segment for segment in result["segments"] if segment["customers"]]
+    assert [(segment["segment"], segment["customers"]) for segment in populated] == [("new", 10)]
+
+
+def test_everyone_ordering_recently_is_not_hibernating():
+    # Ten customers who all ordered today, half of them twice
+    now = time.time()
+    customer = np.concatenate([np.arange(10), np.arange(5)])
+    timestamps = np.full(15, now - 3600)
+    amounts = np.full(15, 1000.0)
+
+    result = rfm(customer, timestamps, amounts, 10, now)
+
+    segments = {segment["segment"]: segment["customers"] for segment in result["segments"] if segment["customers"]}
+    assert segments == {"loyal": 5, "new": 5}
+
+
+def test_recent_one_order_customers_are_new():
+    # Most customers order once; the most recent of them must not fall out of "new"
+    now = time.time()
+    customer = np.concatenate([np.arange(20), np.repeat([20, 21], 3)])
+    timestamps = np.concatenate([now - np.arange(20) * 86400.0, np.full(6, now - 40 * 86400)])
+    amounts = np.full(26, 1000.0)
+
+    result = rfm(customer, timestamps, amounts, 22, now)
+
+    segments = {segment["segment"]: segment["customers"] for segment in result["segments"]}
+    assert segments["new"] > 0
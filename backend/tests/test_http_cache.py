@@ -0,0 +1,25 @@
+# backend/tests/test_http_cache.py
+from app.http_cache import etag_matches, negotiate_encoding
+
+
+def test_brotli_is_preferred_over_gzip():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("") == "identity"
+    assert negotiate_encoding("deflate") == "identity"
+
+
+def test_encodings_refused_with_q_zero_are_not_used():
+    assert negotiate_encoding("br;q=0, gzip") == "gzip"
+    assert negotiate_encoding("BR; q=0.0, GZIP;q=0.5") == "gzip"
+    assert negotiate_encoding("br;q=0.000, gzip;q=0") == "identity"
+
+
+def test_etag_matches_any_listed_tag_weakly():
+    etag = '"v42-products"'
+    assert etag_matches('"v42-products"', etag)
+    assert etag_matches('W/"v42-products"', etag)
+    assert etag_matches('"v41-products", W/"v42-products"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"v41-products"', etag)
+    assert not etag_matches("", etag)
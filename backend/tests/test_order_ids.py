@@ -0,0 +1,42 @@
+# backend/tests/test_order_ids.py
+import time
+import uuid
+from datetime import datetime, timedelta
+from app.order_ids import new_order_id, order_created_at, order_reference
+
+
+def test_new_order_id_is_v7_and_encodes_now():
+    before = datetime.utcnow()
+    order_id = new_order_id()
+    after = datetime.utcnow()
+
+    assert order_id.version == 7
+    assert order_id.variant == uuid.RFC_4122
+    # Millisecond precision: truncation can put it just before `before`
+    assert before - timedelta(milliseconds=1) <= order_created_at(order_id) <= after
+
+
+def test_order_created_at_is_none_for_random_and_invalid_ids():
+    assert order_created_at(uuid.uuid4()) is None
+    assert order_created_at("not-a-uuid") is None
+
+
+def test_order_created_at_accepts_strings():
+    order_id = new_order_id()
+    assert order_created_at(str(order_id)) == order_created_at(order_id)
+
+
+def test_ids_sort_by_creation_time():
+    first = new_order_id()
+    time.sleep(0.002)
+    second = new_order_id()
+    assert first < second
+
+
+def test_references_of_orders_in_the_same_minute_differ():
+    ids = [new_order_id() for _ in range(100)]
+    # The time prefix is shared...
+    assert len({str(order_id)[:8] for order_id in ids}) <= 2
+    # ...the reference is not
+    assert len({order_reference(order_id) for order_id in ids}) == len(ids)
+    assert order_reference(ids[0]) == str(ids[0])[-8:].upper()
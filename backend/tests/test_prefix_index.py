@@ -0,0 +1,106 @@
+# backend/tests/test_prefix_index.py
+import threading
+from app.prefix_index import PrefixIndex, SuggestionIndex
+
+
+def texts(suggestions):
+    return [suggestion["text"] for suggestion in suggestions]
+
+
+def snapshot(index):
+    return sorted(index.keys), index.entries, index.products, index.sub_categories
+
+
+def test_lookup_matches_any_word_and_ranks_by_weight():
+    index = PrefixIndex.build(
+        [("a", "Silk Saree", "Sarees", 5), ("b", "Gold Necklace", "Necklaces", 9)],
+        [("silk sarees", 3)]
+    )
+    assert texts(index.lookup("sa", 10)) == ["Silk Saree", "Sarees", "silk sarees"]
+    assert texts(index.lookup("g", 10)) == ["Gold Necklace"]
+    # Equal weights: products before sub-categories
+    assert texts(index.lookup("neck", 10)) == ["Gold Necklace", "Necklaces"]
+    assert texts(index.lookup("", 1)) == ["Gold Necklace"]
+
+
+def test_incremental_updates_match_a_rebuild():
+    index = PrefixIndex.build([("a", "Silk Saree", "Sarees", 5), ("b", "Cotton Saree", "Sarees", 2)], [])
+
+    index.put_product("a", ("Kanjivaram Silk Saree", "Bridal Sarees", 7))  # rename, move sub-category
+    index.put_product("b", None)  # delete: "Sarees" is left empty
+    index.put_product("c", ("Temple Necklace", "Necklaces", 1))  # create
+
+    rebuilt = PrefixIndex.build(
+        [("a", "Kanjivaram Silk Saree", "Bridal Sarees", 7), ("c", "Temple Necklace", "Necklaces", 1)], []
+    )
+    assert snapshot(index) == snapshot(rebuilt)
+    assert texts(index.lookup("cotton", 10)) == []
+    assert "sub_category:sarees" not in index.entries
+
+
+def test_sub_category_weight_follows_its_products():
+    index = PrefixIndex.build([("a", "Silk Saree", "Sarees", 5), ("b", "Cotton Saree", "sarees", 2)], [])
+    assert index.sub_categories["sarees"] == ["Sarees", 2, 7]
+
+    index.put_product("b", ("Cotton Saree", "Sarees", 10))
+    assert index.sub_categories["sarees"] == ["Sarees", 2, 15]
+    assert index.entries["sub_category:sarees"][0] == 15
+
+
+class Database:
+    """Product rows as the loader would read them; sessions are just handles"""
+
+    def __init__(self, rows):
+        self.rows = dict(rows)
+        self.loading = threading.Event()
+        self.release = threading.Event()
+        self.block = False
+
+    def session(self):
+        return self
+
+    def close(self):
+        pass
+
+    def load_products(self, db, product_ids=None):
+        if product_ids is not None:
+            return [(product_id, *self.rows[product_id]) for product_id in product_ids if product_id in self.rows]
+        rows = [(product_id, *row) for product_id, row in self.rows.items()]
+        if self.block:
+            self.loading.set()
+            self.release.wait(5)
+        return rows
+
+
+def test_empty_prefix_suggests_nothing():
+    database = Database({"a": ("Silk Saree", "Sarees", 5)})
+    index = SuggestionIndex(database.session, database.load_products)
+    index.rebuild()
+
+    assert index.suggest(database, "   ") == []
+    assert texts(index.suggest(database, " SILK ")) == ["Silk Saree"]
+
+
+def test_lookups_use_the_old_index_until_the_rebuild_swaps_in():
+    database = Database({"a": ("Silk Saree", "Sarees", 5)})
+    index = SuggestionIndex(database.session, database.load_products)
+    index.rebuild()
+
+    database.rows["b"] = ("Silk Dupatta", None, 9)  # not announced: only a rebuild picks it up
+    database.block = True
+    index.start_rebuild()
+    assert database.loading.wait(5)
+
+    # The rows are read; a write lands after that and is announced
+    database.rows["a"] = ("Silk Lehenga", "Lehengas", 5)
+    index.product_changed("a")
+    # Meanwhile lookups are served, from the old index plus the announced write
+    assert texts(index.suggest(database, "silk")) == ["Silk Lehenga"]
+
+    database.release.set()
+    while index._rebuilding:
+        threading.Event().wait(0.01)
+
+    # New index swapped in, and the write it missed applied on top of it
+    assert texts(index.suggest(database, "silk")) == ["Silk Dupatta", "Silk Lehenga"]
+    assert texts(index.suggest(database, "saree")) == []
@@ -0,0 +1,18 @@
+# backend/tests/test_query_log.py
+from app.query_log import normalize_statement
+
+
+def test_parameters_and_literals_collapse():
+    assert normalize_statement(
+        "SELECT * FROM products WHERE id = %(id_1)s AND price > 100.5 AND name = 'it''s' LIMIT %s"
+    ) == "SELECT * FROM products WHERE id = ? AND price > ? AND name = ? LIMIT ?"
+
+
+def test_in_lists_of_any_length_compare_equal():
+    two = normalize_statement("SELECT * FROM products WHERE id IN (%(id_1)s, %(id_2)s)")
+    three = normalize_statement("SELECT * FROM products WHERE id IN ($1,$2,$3)")
+    assert two == three == "SELECT * FROM products WHERE id IN (?)"
+
+
+def test_whitespace_is_collapsed_and_identifiers_kept():
+    assert normalize_statement("SELECT col1\n  FROM  table2\n") == "SELECT col1 FROM table2"
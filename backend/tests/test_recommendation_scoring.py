@@ -0,0 +1,45 @@
+# backend/tests/test_recommendation_scoring.py
+import math
+import numpy as np
+import pytest
+from scipy import sparse
+from app.recommendation_scoring import top_neighbours
+
+A, B, C, D = range(4)
+
+
+def order_matrix(orders) -> sparse.csr_matrix:
+    matrix = np.zeros((len(orders), 4))
+    for row, products in enumerate(orders):
+        matrix[row, products] = 1
+    return sparse.csr_matrix(matrix)
+
+
+# A and B bought together twice, A and best seller C twice, A and D once
+ORDERS = order_matrix([[A, B], [A, B], [A, C], [A, C], [A, D]] + [[C]] * 6)
+
+
+def test_niche_partners_outrank_best_sellers():
+    columns, scores = top_neighbours(ORDERS)[A]
+
+    assert columns == [B, C]
+    # Co-purchases over the geometric mean of both products' order counts
+    assert scores == pytest.approx([2 / math.sqrt(5 * 2), 2 / math.sqrt(5 * 8)])
+
+
+def test_pairs_below_min_support_are_dropped():
+    neighbours = top_neighbours(ORDERS)
+    assert neighbours[D] == ([], [])
+
+    columns, _ = top_neighbours(ORDERS, min_support=1)[D]
+    assert columns == [A]
+
+
+def test_top_n_keeps_the_best_scores():
+    columns, _ = top_neighbours(ORDERS, top_n=1)[A]
+    assert columns == [B]
+
+
+def test_products_are_not_their_own_neighbour():
+    for product, (columns, _) in enumerate(top_neighbours(ORDERS, min_support=1)):
+        assert product not in columns
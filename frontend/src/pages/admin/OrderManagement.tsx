@@ -158,7 +158,7 @@ const OrderManagement = () => {
                 <tbody className="divide-y divide-gray-200">
                   {filteredOrders&&filteredOrders.map((order: Order) => (
                     <tr key={order.id} className="hover:bg-gray-50">
-                      <td className="py-4 px-6 font-medium">#{order.id.slice(0, 8)}</td>
+                      <td className="py-4 px-6 font-medium">#{order.id.slice(-8).toUpperCase()}</td>
                       <td className="py-4 px-6">
                         <div>
                           <div className="font-medium">{order.customer_name}</div>
@@ -18,12 +18,20 @@ const ProductManagement = () => {
 
   const API_URL = import.meta.env.VITE_API_URL || '/api';
 
+  // The API caps a page at 100 products, so page through until a short page
+  const PAGE_SIZE = 100;
+
   const { data: productsData, isLoading, refetch } = useQuery({
     queryKey: ['admin-products'],
     queryFn: async () => {
       try {
-        const response = await axios.get(`${API_URL}/products/?skip=0&limit=100`);
-        return response.data;
+        const allProducts: Product[] = [];
+        for (let skip = 0; ; skip += PAGE_SIZE) {
+          const response = await axios.get(`${API_URL}/products/?skip=${skip}&limit=${PAGE_SIZE}`);
+          allProducts.push(...response.data);
+          if (response.data.length < PAGE_SIZE) break;
+        }
+        return allProducts;
       } catch (error) {
         console.error('Error fetching products:', error);
         return { products: [] };